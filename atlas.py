@@ -0,0 +1,156 @@
+"""
+Sprite atlas class.
+
+Packs many small images into one texture,
+so they are read from disk with a single decode
+and served as subsurfaces of the texture.
+"""
+import pygame
+import json
+
+
+class SpriteAtlas():
+    """
+    Used to create sprite atlas object.
+
+    Frames are packed in shelves (rows) sorted by height,
+    every frame is a named region of the texture.
+    Precomputed variants of a frame (e.g. flipped or rotated)
+    are named frame:variant.
+    Atlas is stored as two files: path.png and path.json.
+    """
+    PADDING = 1
+    SEPARATOR = ':'
+
+    def __init__(self, texture, regions):
+        """
+        Initializes sprite atlas object.
+
+        Parameters
+        ----------
+        texture : pygame.Surface
+        regions : dict (frame name: (x, y, width, height))
+        """
+        self.texture = texture
+        self.regions = {name: tuple(region)
+                        for name, region in regions.items()}
+        self.frames = {}
+
+    @classmethod
+    def pack(cls, images, max_width=1024):
+        """
+        Returns atlas containing given images.
+
+        Parameters
+        ----------
+        images : dict (frame name: pygame.Surface)
+        max_width : int (width of the texture)
+        """
+        padding = cls.PADDING
+        order = sorted(images, key=lambda name: (-images[name].get_height(),
+                                                 name))
+        regions = {}
+        x = y = shelf_height = width = 0
+
+        for name in order:
+            w, h = images[name].get_size()
+            if x and x + w > max_width:
+                x = 0
+                y += shelf_height + padding
+                shelf_height = 0
+            regions[name] = (x, y, w, h)
+            x += w + padding
+            shelf_height = max(shelf_height, h)
+            width = max(width, x - padding)
+
+        texture = pygame.Surface((max(width, 1), max(y + shelf_height, 1)),
+                                 pygame.SRCALPHA, 32)
+        texture.fill((0, 0, 0, 0))
+        for name, region in regions.items():
+            texture.blit(images[name], region[:2])
+        return cls(texture, regions)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads atlas from path.png and path.json.
+        Texture is converted to display format
+        if display is already created.
+
+        Parameters
+        ----------
+        path : str (path without extension)
+        """
+        with open(path + '.json') as file:
+            regions = json.load(file)['regions']
+        atlas = cls(pygame.image.load(path + '.png'), regions)
+        atlas.convert()
+        return atlas
+
+    def convert(self):
+        """
+        Converts texture to display format
+        if display is already created.
+        """
+        if pygame.display.get_surface() is not None:
+            self.texture = self.texture.convert_alpha()
+            self.frames.clear()
+
+    def save(self, path):
+        """
+        Saves atlas to path.png and path.json.
+
+        Parameters
+        ----------
+        path : str (path without extension)
+        """
+        pygame.image.save(self.texture, path + '.png')
+        with open(path + '.json', 'w') as file:
+            json.dump({'size': self.texture.get_size(),
+                       'regions': self.regions}, file, indent=2,
+                      sort_keys=True)
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def names(self, prefix=''):
+        """
+        Returns sorted names of frames starting with prefix,
+        without their variants.
+
+        Parameters
+        ----------
+        prefix : str
+        """
+        return sorted(name for name in self.regions
+                      if name.startswith(prefix)
+                      and SpriteAtlas.SEPARATOR not in name)
+
+    def variant(self, name, variant):
+        """
+        Returns variant of frame as subsurface,
+        None if it was not packed.
+
+        Parameters
+        ----------
+        name : str (frame name)
+        variant : str (e.g. flip, rot3)
+        """
+        name = name + SpriteAtlas.SEPARATOR + variant
+        if name not in self.regions:
+            return None
+        return self.frame(name)
+
+    def frame(self, name):
+        """
+        Returns frame as subsurface of the texture.
+
+        Parameters
+        ----------
+        name : str
+        """
+        frame = self.frames.get(name)
+        if frame is None:
+            frame = self.texture.subsurface(self.regions[name])
+            self.frames[name] = frame
+        return frame
@@ -0,0 +1,183 @@
+"""
+Audio manager class.
+
+Streams music from disk, keeps sound effects in memory
+and shares mixer channels between them.
+"""
+import pygame
+import os
+from gameObjects import get_path
+
+
+class AudioManager():
+    """
+    Used to create audio manager object.
+
+    Sound effects are loaded once per process and shared
+    by all managers. Every effect has priority and voice limit
+    (maximum number of channels playing it at once).
+    Effect over its limit replaces its own oldest voice,
+    if no channel is free it replaces the oldest voice
+    of lower or equal priority, otherwise it is dropped.
+    """
+    CHANNELS = 16
+    # file name: (priority, voice limit, volume)
+    SOUNDS = {'gunShot.wav': (1, 3, 1.0),
+              'machineGun.wav': (1, 4, 1.0),
+              'lost.wav': (10, 1, 1.0)}
+    cache = {}
+
+    def __init__(self, channels=CHANNELS):
+        """
+        Initializes audio manager object.
+        Manager plays nothing if mixer is not initialized.
+
+        Parameters
+        ----------
+        channels : int (size of channel pool)
+        """
+        self.enabled = pygame.mixer.get_init() is not None
+        self.voices = [None] * channels
+        self.started = 0
+        self.music = None
+        self.music_paused = True
+        self.counters = {}
+        if self.enabled:
+            pygame.mixer.set_num_channels(channels)
+            self.channels = [pygame.mixer.Channel(i)
+                             for i in range(channels)]
+        else:
+            self.channels = []
+
+    @classmethod
+    def sound(cls, name):
+        """
+        Returns sound effect from sounds directory,
+        loaded only the first time.
+
+        Parameters
+        ----------
+        name : str (file name)
+        """
+        sound = cls.cache.get(name)
+        if sound is None:
+            sound = pygame.mixer.Sound(get_path('sounds', name))
+            sound.set_volume(cls.SOUNDS.get(name, (0, 1, 1.0))[2])
+            cls.cache[name] = sound
+        return sound
+
+    def preload(self, *names):
+        """
+        Loads given sound effects ahead of time.
+
+        Parameters
+        ----------
+        names : str (file names)
+        """
+        if self.enabled:
+            for name in names:
+                self.sound(name)
+
+    def play(self, name):
+        """
+        Plays sound effect on channel from the pool.
+        Returns used channel, None if sound was dropped.
+
+        Parameters
+        ----------
+        name : str (file name)
+        """
+        if not self.enabled:
+            return None
+        counter = self.counters.setdefault(
+            name, {'played': 0, 'stolen': 0, 'dropped': 0})
+        priority, limit, _ = AudioManager.SOUNDS.get(name, (0, 1, 1.0))
+        sound = self.sound(name)
+
+        free = None
+        own = []
+        weaker = []
+        for i, channel in enumerate(self.channels):
+            voice = self.voices[i]
+            if voice is None or not channel.get_busy():
+                if free is None:
+                    free = i
+                continue
+            if voice[0] == name:
+                own.append(i)
+            if voice[1] <= priority:
+                weaker.append(i)
+
+        if len(own) >= limit:
+            index = self.oldest(own)
+            counter['stolen'] += 1
+        elif free is not None:
+            index = free
+        elif weaker:
+            index = self.oldest(weaker)
+            counter['stolen'] += 1
+        else:
+            counter['dropped'] += 1
+            return None
+
+        self.started += 1
+        self.voices[index] = (name, priority, self.started)
+        self.channels[index].play(sound)
+        counter['played'] += 1
+        return self.channels[index]
+
+    def oldest(self, indexes):
+        """
+        Returns index of the channel playing the longest.
+
+        Parameters
+        ----------
+        indexes : list (channel indexes)
+        """
+        return min(indexes, key=lambda i: self.voices[i][2])
+
+    def play_music(self, name, volume=0.5):
+        """
+        Starts streaming music in a loop, paused.
+        Game runs without music if file is missing.
+
+        Parameters
+        ----------
+        name : str (file name)
+        volume : float
+        """
+        path = get_path('sounds', name)
+        if not self.enabled or not os.path.exists(path):
+            self.music = None
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(-1)
+        pygame.mixer.music.pause()
+        self.music = name
+        self.music_paused = True
+
+    def pause_music(self):
+        """
+        Pauses music if it is playing.
+        """
+        if self.music is not None and not self.music_paused:
+            pygame.mixer.music.pause()
+            self.music_paused = True
+
+    def unpause_music(self):
+        """
+        Resumes paused music.
+        """
+        if self.music is not None and self.music_paused:
+            pygame.mixer.music.unpause()
+            self.music_paused = False
+
+    def stats(self):
+        """
+        Returns play counters of every sound effect
+        and number of busy channels.
+        """
+        busy = sum(channel.get_busy() for channel in self.channels)
+        return {'sounds': self.counters, 'busy': busy,
+                'channels': len(self.voices), 'cached': len(self.cache)}
@@ -0,0 +1,51 @@
+"""
+Asset bake script.
+
+Packs animation frames, small images and their flipped
+and rotated variants into one atlas
+(images/atlas.png and images/atlas.json),
+which is loaded by the game instead of separate files.
+Without baked atlas the game packs it at startup.
+Run again after changing any image.
+
+With --map the map image is also split into chunks,
+which are loaded by the game when Game.MAP_PATH points to them.
+Obstacles can then be added to "obstacles" list in index.json
+as [x, y, width, height], zombies walk around them.
+
+Example:
+python bake.py --map maps/large --repeat 8 8
+"""
+import argparse
+import pygame
+from gameObjects import Assets, get_path
+from tilemap import TileMap
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Bake game assets.')
+    parser.add_argument('--map', metavar='PATH',
+                        help='directory of chunked map, relative to game')
+    parser.add_argument('--repeat', type=int, nargs=2, default=[1, 1],
+                        help='copies of map image in a row and column')
+    parser.add_argument('--chunk-size', type=int,
+                        default=TileMap.CHUNK_SIZE)
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    atlas = Assets.bake()
+    width, height = atlas.texture.get_size()
+    print(f'Baked {len(atlas.regions)} frames into '
+          f'{width}x{height} atlas')
+
+    if args.map:
+        image = pygame.image.load(get_path('images', 'map.jpg'))
+        tilemap = TileMap.bake(image, get_path(args.map), args.repeat,
+                               args.chunk_size)
+        print(f'Baked {tilemap.columns}x{tilemap.rows} chunks of '
+              f'{tilemap.rect.width}x{tilemap.rect.height} map')
@@ -0,0 +1,10 @@
+"""
+Benchmark package.
+
+Runs reproducible headless scenarios
+and reports timings of every game phase.
+"""
+from bench.scenario import Scenario
+from bench.runner import run_scenario, write_results
+from bench.memory import entity_memory
+from bench.snapshots import snapshot_costs
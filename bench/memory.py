@@ -0,0 +1,45 @@
+"""
+Memory benchmark function.
+
+Measures how many bytes a single zombie and bullet take.
+"""
+import tracemalloc
+from gameObjects import Entity, Zombie, Bullet
+
+
+def entity_memory(game, count=10000):
+    """
+    Spawns count zombies and fires count bullets,
+    returns average number of bytes allocated per object.
+    Pools are emptied before and after measurement.
+
+    Parameters
+    ----------
+    game : Game()
+    count : int
+    """
+    world = game.world
+    world.reset()
+    zombie_pool, bullet_pool = world.zombie_pool, world.bullet_pool
+    capacities = zombie_pool.capacity, bullet_pool.capacity
+    zombie_pool.capacity = zombie_pool.created + count
+    bullet_pool.capacity = bullet_pool.created + count
+    zombie_pool.free.clear()
+    bullet_pool.free.clear()
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        Zombie.spawn(game)
+    zombies = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        Bullet.fire(game, (0, 0), (1, 1), 7, 1)
+    bullets = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    world.reset()
+    Entity.add(game.player)
+    zombie_pool.capacity, bullet_pool.capacity = capacities
+    return {'count': count,
+            'zombie_bytes': (zombies - start) / count,
+            'bullet_bytes': (bullets - zombies) / count}
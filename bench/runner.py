@@ -0,0 +1,102 @@
+"""
+Benchmark runner functions.
+
+Steps the game phase by phase, measures every phase
+and reports percentiles which can be saved as JSON.
+"""
+import json
+import platform
+import subprocess
+from time import perf_counter
+
+import pygame
+from gameObjects import Zombie, Bullet, get_path
+from profiler import percentiles
+
+PHASES = ('input', 'spawn', 'physics', 'collision', 'render')
+
+
+def run_scenario(game, scenario):
+    """
+    Runs scenario in given headless game.
+    Returns dict with scenario parameters
+    and timings of every phase.
+
+    Parameters
+    ----------
+    game : Game()
+    scenario : Scenario()
+    """
+    scenario.setup(game)
+    world = game.world
+    player = game.player
+    player.gun = player.guns[1]
+    timings = {phase: [] for phase in PHASES}
+    totals = []
+
+    for tick in range(scenario.ticks):
+        t0 = perf_counter()
+        game.script.apply(game, tick)
+        scenario.move_player(tick)
+        t1 = perf_counter()
+        player.spawn_zombie()
+        scenario.refill_bullets()
+        t2 = perf_counter()
+        player.run()
+        player.gun.shoot()
+        Bullet.move(world)
+        t3 = perf_counter()
+        Zombie.collide(world)
+        game.lost = False
+        t4 = perf_counter()
+        Zombie.move(world)
+        game.camera.follow(player.rect)
+        game.ticks += 1
+        t5 = perf_counter()
+        if scenario.render:
+            game.draw()
+        t6 = perf_counter()
+
+        timings['input'].append(t1 - t0)
+        timings['spawn'].append(t2 - t1)
+        timings['physics'].append(t3 - t2 + t5 - t4)
+        timings['collision'].append(t4 - t3)
+        timings['render'].append(t6 - t5)
+        totals.append(t6 - t0)
+
+    result = scenario.params()
+    result['phases'] = {phase: percentiles(samples)
+                        for phase, samples in timings.items()}
+    result['tick'] = percentiles(totals)
+    result['zombies_end'] = Zombie.count(world)
+    result['pools'] = {'zombies': world.zombie_pool.stats(),
+                       'bullets': world.bullet_pool.stats()}
+    return result
+
+
+def environment():
+    """
+    Returns information about current commit and interpreter.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True,
+                                cwd=get_path()).stdout.strip()
+    except OSError:
+        commit = ''
+    return {'commit': commit, 'python': platform.python_version(),
+            'pygame': pygame.version.ver, 'machine': platform.machine()}
+
+
+def write_results(results, path):
+    """
+    Saves benchmark results as JSON.
+
+    Parameters
+    ----------
+    results : list (dicts returned by run_scenario)
+    path : str
+    """
+    with open(path, 'w') as file:
+        json.dump({'environment': environment(), 'results': results},
+                  file, indent=2)
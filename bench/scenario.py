@@ -0,0 +1,142 @@
+"""
+Scenario class.
+
+Describes and prepares a reproducible benchmark world.
+"""
+import math
+from bots import ScriptedInput
+from gameObjects import Entity, Zombie, Bullet
+
+# spawn delay which never runs out during a benchmark,
+# largest value stored by world snapshots
+NO_SPAWN = 2 ** 31 - 1
+
+
+class Scenario():
+    """
+    Used to create scenario object.
+
+    Keeps fixed populations of zombies and bullets.
+    Bullets deal no damage by default, so zombie count stays constant,
+    bullets which hit or leave the map are replaced in spawn phase.
+    Player circles around the middle of the map
+    and is never killed, zombies keep chasing it.
+    """
+    def __init__(self, zombies=100, bullets=0, ticks=1000, seed=0,
+                 numpy=False, grid=True, render=True, damage=0, lod=True):
+        """
+        Initializes scenario object.
+
+        Parameters
+        ----------
+        zombies : int
+        bullets : int
+        ticks : int
+        seed : int
+        numpy : bool (store zombies in Horde)
+        grid : bool (use spatial grid for collisions)
+        render : bool (include render phase)
+        damage : int (damage of bullets)
+        lod : bool (update far zombies in turns)
+        """
+        self.zombies = zombies
+        self.bullets = bullets
+        self.ticks = ticks
+        self.seed = seed
+        self.numpy = numpy
+        self.grid = grid
+        self.render = render
+        self.damage = damage
+        self.lod = lod
+        self.game = None
+
+    @property
+    def name(self):
+        """
+        Returns short description of the scenario.
+        """
+        engine = 'numpy' if self.numpy else 'objects'
+        collisions = 'grid' if self.grid else 'brute'
+        name = f'{self.zombies}z-{self.bullets}b-{engine}-{collisions}'
+        return name if self.lod else name + '-nolod'
+
+    def params(self):
+        """
+        Returns parameters of the scenario as dict.
+        """
+        return {'name': self.name, 'zombies': self.zombies,
+                'bullets': self.bullets, 'ticks': self.ticks,
+                'seed': self.seed, 'numpy': self.numpy, 'grid': self.grid,
+                'render': self.render, 'damage': self.damage,
+                'lod': self.lod}
+
+    def setup(self, game):
+        """
+        Resets the game and fills it
+        with scenario population.
+
+        Parameters
+        ----------
+        game : Game()
+        """
+        world = game.world
+        world.rng.seed(self.seed)
+        self.game = game
+        world.reset()
+        Entity.add(game.player)
+        game.player.kills = 0
+        for gun in game.player.guns:
+            gun.delay = gun.delay_value
+        Zombie.enable_horde(game, self.numpy, max(self.zombies, 1))
+        world.use_grid = self.grid
+        world.lod_budget = Zombie.LOD_BUDGET if self.lod else None
+        world.spawn_delay = NO_SPAWN
+        game.lost = False
+        game.playing = True
+        game.script = ScriptedInput([(('fire',), game.map_rect.center)])
+
+        for _ in range(self.zombies):
+            self.spawn_zombie()
+        self.refill_bullets()
+
+    def random_position(self):
+        """
+        Returns random position inside the map.
+        """
+        rng = self.game.world.rng
+        return (rng.randint(0, self.game.map_rect.width),
+                rng.randint(0, self.game.map_rect.height))
+
+    def spawn_zombie(self):
+        """
+        Adds zombie at random position.
+        """
+        pos = self.random_position()
+        if self.game.world.horde is not None:
+            self.game.world.horde.spawn(pos)
+        else:
+            zombie = Zombie.spawn(self.game)
+            zombie.rect.midbottom = pos
+            zombie.move_to(zombie.rect.topleft)
+
+    def refill_bullets(self):
+        """
+        Adds bullets flying in random directions
+        until their count matches the scenario.
+        """
+        for _ in range(self.bullets - len(self.game.world.bullets)):
+            Bullet.fire(self.game, self.random_position(),
+                        self.random_position(), 7, self.damage)
+
+    def move_player(self, tick):
+        """
+        Moves player along a circle around the middle of the map.
+
+        Parameters
+        ----------
+        tick : int
+        """
+        cx, cy = self.game.map_rect.center
+        angle = tick / 240 * math.pi
+        self.game.player.move_to((cx + math.cos(angle) * 200,
+                                  cy + math.sin(angle) * 150))
@@ -0,0 +1,58 @@
+"""
+Snapshot benchmark function.
+
+Measures size of world snapshot and time
+needed to capture and restore it.
+"""
+import math
+from time import perf_counter
+from gameObjects import Zombie, Bullet
+from profiler import percentiles
+from snapshot import WorldSnapshot
+
+
+def snapshot_costs(game, zombies, bullets=0, repeat=20):
+    """
+    Spawns zombies and fires bullets, returns size of snapshot
+    and timings of capture and restore.
+    Zombies and bullets are deleted afterwards.
+
+    Parameters
+    ----------
+    game : Game()
+    zombies : int
+    bullets : int
+    repeat : int (number of measured captures and restores)
+    """
+    world = game.world
+    Zombie.reset(world)
+    Bullet.reset(world)
+    for _ in range(zombies):
+        if world.horde is not None:
+            world.horde.spawn(world.rng.choice(world.spawns))
+        else:
+            Zombie.spawn(game)
+    x, y = game.player.rect.center
+    for i in range(bullets):
+        angle = i / max(bullets, 1) * math.tau
+        Bullet.fire(game, (x, y), (x + math.cos(angle), y + math.sin(angle)),
+                    7, 1)
+
+    captures = []
+    restores = []
+    for _ in range(repeat):
+        t0 = perf_counter()
+        snapshot = WorldSnapshot.capture(game)
+        t1 = perf_counter()
+        snapshot.restore(game)
+        t2 = perf_counter()
+        captures.append(t1 - t0)
+        restores.append(t2 - t1)
+
+    entities = Zombie.count(world) + len(world.bullets)
+    Zombie.reset(world)
+    Bullet.reset(world)
+    return {'zombies': zombies, 'bullets': bullets, 'bytes': len(snapshot),
+            'bytes_per_entity': len(snapshot) / max(entities, 1),
+            'capture': percentiles(captures),
+            'restore': percentiles(restores)}
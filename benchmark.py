@@ -0,0 +1,83 @@
+"""
+Main file used for running benchmarks.
+
+Example:
+python benchmark.py --zombies 100 1000 10000 --bullets 50 --numpy
+"""
+import argparse
+from game import Game
+from gameObjects import Zombie
+from bench import (Scenario, run_scenario, write_results, entity_memory,
+                   snapshot_costs)
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Run game benchmarks.')
+    parser.add_argument('--zombies', type=int, nargs='+',
+                        default=[100, 1000, 10000])
+    parser.add_argument('--bullets', type=int, default=50)
+    parser.add_argument('--ticks', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--numpy', action='store_true',
+                        help='store zombies in NumPy arrays')
+    parser.add_argument('--brute-force', action='store_true',
+                        help='check collisions without spatial grid')
+    parser.add_argument('--no-render', action='store_true')
+    parser.add_argument('--no-lod', action='store_true',
+                        help='update every zombie every tick')
+    parser.add_argument('--map-repeat', type=int, nargs=2,
+                        default=list(Game.MAP_REPEAT),
+                        help='copies of map image in a row and column')
+    parser.add_argument('--memory', action='store_true',
+                        help='measure bytes per zombie and bullet')
+    parser.add_argument('--snapshot', action='store_true',
+                        help='measure size and speed of world snapshots')
+    parser.add_argument('--output', default='bench_output.json')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    Game.MAP_REPEAT = tuple(args.map_repeat)
+    game = Game(headless=True)
+    results = []
+
+    for zombies in args.zombies:
+        scenario = Scenario(zombies, args.bullets, args.ticks, args.seed,
+                            args.numpy, not args.brute_force,
+                            not args.no_render, lod=not args.no_lod)
+        result = run_scenario(game, scenario)
+        results.append(result)
+
+        print(f"{scenario.name}: tick p50 {result['tick']['p50']:.3f} ms, "
+              f"p99 {result['tick']['p99']:.3f} ms")
+        for phase, stats in result['phases'].items():
+            print(f"  {phase:<10} p50 {stats['p50']:.3f} ms, "
+                  f"p99 {stats['p99']:.3f} ms")
+
+    if args.memory:
+        memory = entity_memory(game)
+        results.append({'name': 'memory', **memory})
+        print(f"memory: {memory['zombie_bytes']:.0f} B per zombie, "
+              f"{memory['bullet_bytes']:.0f} B per bullet")
+
+    if args.snapshot:
+        Zombie.enable_horde(game, args.numpy)
+        storage = 'numpy' if args.numpy else 'objects'
+        for zombies in args.zombies:
+            costs = snapshot_costs(game, zombies, args.bullets)
+            results.append({'name': f'snapshot-{zombies}z-{storage}',
+                            'storage': storage, **costs})
+            print(f"snapshot {zombies}z-{args.bullets}b-{storage}: "
+                  f"{costs['bytes']} B, "
+                  f"capture p50 {costs['capture']['p50']:.3f} ms, "
+                  f"restore p50 {costs['restore']['p50']:.3f} ms")
+        if not args.numpy:
+            print('Zombie objects are captured and restored one by one, '
+                  'over 1 ms per 1000 zombies; only --numpy stays '
+                  'under a millisecond for thousands of zombies')
+
+    write_results(results, args.output)
@@ -0,0 +1,144 @@
+"""
+Scripted input classes.
+
+Used to control the player without pygame events,
+e.g. in headless games, load tests and bot matches.
+"""
+import math
+
+
+class ScriptedInput():
+    """
+    Base class for other scripted inputs
+    to inherit from.
+
+    Plays back given list of inputs, one for every tick.
+    Every input is (held actions, mouse position),
+    actions are names from Controls.ACTIONS.
+    After last input the last one is repeated.
+    """
+    def __init__(self, inputs=()):
+        """
+        Initializes scripted input object.
+
+        Parameters
+        ----------
+        inputs : list (({str, ...}, (int, int)) for every tick)
+        """
+        self.inputs = list(inputs)
+
+    def apply(self, game, tick):
+        """
+        Sets input state of the game for given tick.
+
+        Parameters
+        ----------
+        game : Game()
+        tick : int
+        """
+        if not self.inputs:
+            return
+        actions, mouse_pos = self.inputs[min(tick, len(self.inputs) - 1)]
+        game.controls.set_actions(actions, mouse_pos)
+
+
+class IdleBot(ScriptedInput):
+    """
+    Used to create bot which does nothing.
+    Inherits from ScriptedInput class.
+    """
+    def apply(self, game, tick):
+        """
+        Releases every action.
+
+        Parameters
+        ----------
+        game : Game()
+        tick : int
+        """
+        game.controls.set_actions((), game.controls.mouse_pos)
+
+
+class TurretBot(ScriptedInput):
+    """
+    Used to create bot which stands still
+    and shoots at the nearest zombie.
+    Inherits from ScriptedInput class.
+    """
+    def __init__(self, weapon=0):
+        """
+        Initializes turret bot object.
+
+        Parameters
+        ----------
+        weapon : int (index of used gun)
+        """
+        ScriptedInput.__init__(self)
+        self.weapon = ('weapon_1', 'weapon_2')[weapon]
+
+    @staticmethod
+    def nearest_zombie(game):
+        """
+        Returns center of the zombie closest to player,
+        None if there are no zombies.
+
+        Parameters
+        ----------
+        game : Game()
+        """
+        px, py = game.player.rect.center
+        targets = [z.rect.center for z in game.world.zombies]
+        horde = game.world.horde
+        if horde is not None and horde.count:
+            left, top, right, bottom = horde.rects()
+            targets += list(zip(((left + right) // 2).tolist(),
+                                ((top + bottom) // 2).tolist()))
+        if not targets:
+            return None
+        return min(targets, key=lambda t: math.hypot(t[0] - px, t[1] - py))
+
+    def apply(self, game, tick):
+        """
+        Aims at the nearest zombie and shoots.
+
+        Parameters
+        ----------
+        game : Game()
+        tick : int
+        """
+        target = self.nearest_zombie(game)
+        if target is None:
+            game.controls.set_actions((self.weapon,), game.controls.mouse_pos)
+        else:
+            game.controls.set_actions((self.weapon, 'fire'),
+                                      game.camera.to_screen(target))
+
+
+class KitingBot(TurretBot):
+    """
+    Used to create bot which runs away
+    from the nearest zombie while shooting at it.
+    Inherits from TurretBot class.
+    """
+    def apply(self, game, tick):
+        """
+        Moves away from the nearest zombie
+        and shoots at it.
+
+        Parameters
+        ----------
+        game : Game()
+        tick : int
+        """
+        target = self.nearest_zombie(game)
+        if target is None:
+            game.controls.set_actions((self.weapon,), game.controls.mouse_pos)
+            return
+
+        px, py = game.player.rect.center
+        actions = [self.weapon, 'fire']
+        if abs(target[0] - px) < 200:
+            actions.append('left' if target[0] > px else 'right')
+        if abs(target[1] - py) < 200:
+            actions.append('up' if target[1] > py else 'down')
+        game.controls.set_actions(actions, game.camera.to_screen(target))
@@ -0,0 +1,168 @@
+"""
+Game client class.
+
+Thin client of the game server: sends input of the local
+controls and draws received snapshots with the drawing code
+of the game, without running the simulation.
+"""
+import asyncio
+from gameObjects import Entity, Zombie, Bullet
+from controls import Controls
+from network import (WELCOME, INPUT, MSG_WELCOME, MSG_INPUT, MSG_SNAPSHOT,
+                     ZOMBIE, read_message, write_message, StateMirror)
+
+
+class GameClient():
+    """
+    Used to create game client object.
+
+    Entities of snapshots are shown by zombies and bullets
+    taken from pools of the local world.
+    Positions are interpolated between the last two snapshots
+    when Game.INTERPOLATE is set.
+    """
+    def __init__(self, game):
+        """
+        Initializes game client object.
+
+        Parameters
+        ----------
+        game : Game()
+        """
+        self.game = game
+        self.mirror = StateMirror()
+        self.objects = {}
+        self.reader = None
+        self.writer = None
+        self.uid = None
+        self.tick_rate = 120
+        self.snapshot_interval = 1
+        self.control = False
+        self.sent_input = None
+        self.received = 0
+        if game.world.horde is not None:
+            Zombie.enable_horde(game, False)
+        game.playing = True
+
+    async def connect(self, host, port):
+        """
+        Connects to server and waits for its welcome message.
+
+        Parameters
+        ----------
+        host : str
+        port : int
+        """
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        message = await read_message(self.reader)
+        if message is None or message[0] != MSG_WELCOME:
+            raise ConnectionError('server did not send welcome message')
+        (self.uid, self.tick_rate, self.snapshot_interval,
+         self.control) = WELCOME.unpack(message[1])
+
+    async def receive(self):
+        """
+        Applies snapshots until server disconnects.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await read_message(self.reader)
+            if message is None:
+                break
+            if message[0] == MSG_SNAPSHOT:
+                self.apply(message[1])
+                self.received = loop.time()
+
+    def apply(self, data):
+        """
+        Updates local player, zombies and bullets with snapshot.
+
+        Parameters
+        ----------
+        data : bytes (payload of SNAPSHOT message)
+        """
+        game = self.game
+        world = game.world
+        header, removed, records = self.mirror.apply(data)
+        Entity.save_positions(world)
+        Bullet.save_positions(world)
+
+        for uid in removed:
+            obj = self.objects.pop(uid, None)
+            if obj is None:
+                continue
+            if isinstance(obj, Zombie):
+                Zombie.kill(obj)
+            else:
+                world.bullet_pool.release(obj)
+
+        for uid, kind, x, y, facing, frame in records:
+            obj = self.objects.get(uid)
+            if obj is None:
+                if kind == ZOMBIE:
+                    obj = world.zombie_pool.acquire(game)
+                else:
+                    obj = world.bullet_pool.acquire()
+                if obj is None:
+                    continue
+                if kind == ZOMBIE:
+                    Entity.add(obj)
+                obj.game = game
+                obj.uid = uid
+                obj.prev_x, obj.prev_y = x, y
+                self.objects[uid] = obj
+            obj.x, obj.y = x, y
+            obj.rect.topleft = (x, y)
+            if kind == ZOMBIE:
+                obj.facing = facing
+                obj.current_image = frame
+            else:
+                obj.frame = Bullet.frames[frame]
+
+        _, kills, x, y, facing, frame, gun = header
+        player = game.player
+        player.kills = kills
+        player.gun = player.guns[gun]
+        player.move_to((x, y))
+        player.facing = facing
+        player.images = player.image_sets[facing]
+        player.current_image = frame
+        player.image = player.images[frame]
+        game.camera.follow(player.rect)
+
+    def send_input(self):
+        """
+        Sends held and pressed actions and mouse position
+        if they changed since the last message.
+        """
+        controls = self.game.controls
+        state = (Controls.mask(controls.held | controls.pressed),
+                 *controls.mouse_pos)
+        if state != self.sent_input:
+            write_message(self.writer, MSG_INPUT, INPUT.pack(*state))
+            self.sent_input = state
+
+    async def run(self):
+        """
+        Handles events, sends input and draws frames
+        until server disconnects or pause (ESC) is pressed.
+        """
+        game = self.game
+        loop = asyncio.get_running_loop()
+        receiver = asyncio.ensure_future(self.receive())
+        frame_time = 1 / game.RENDER_RATE
+        snapshot_time = self.snapshot_interval / self.tick_rate
+        while not receiver.done():
+            game.check_events()
+            if game.controls.consume('pause'):
+                break
+            self.send_input()
+            game.controls.end_tick()
+            if game.INTERPOLATE:
+                alpha = (loop.time() - self.received) / snapshot_time
+                game.draw(min(alpha, 1.0))
+            else:
+                game.draw()
+            await asyncio.sleep(frame_time)
+        self.writer.close()
+        receiver.cancel()
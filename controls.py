@@ -0,0 +1,238 @@
+"""
+Input state class.
+
+Translates keys and mouse buttons into game actions,
+so that gameplay code never looks at raw key codes.
+"""
+import pygame
+
+
+class Controls():
+    """
+    Used to create controls object.
+
+    Held actions are kept in a set, so checking an action is O(1)
+    and repeated or lost events can never duplicate it.
+    Actions pressed and released since the end of the previous tick
+    are kept in pressed and released sets.
+    Every key or mouse button is bound to at most one action,
+    one action can have many bindings.
+    """
+    ACTIONS = ('up', 'down', 'left', 'right', 'sprint', 'fire',
+               'weapon_1', 'weapon_2', 'pause', 'profiler', 'dump_profile',
+               'rewind')
+    KEY_BINDINGS = {pygame.K_w: 'up', pygame.K_s: 'down',
+                    pygame.K_a: 'left', pygame.K_d: 'right',
+                    pygame.K_LSHIFT: 'sprint', pygame.K_1: 'weapon_1',
+                    pygame.K_2: 'weapon_2', pygame.K_ESCAPE: 'pause',
+                    pygame.K_F3: 'profiler', pygame.K_F4: 'dump_profile',
+                    pygame.K_F5: 'rewind'}
+    BUTTON_BINDINGS = {1: 'fire'}
+
+    def __init__(self):
+        """
+        Initializes controls object with default bindings.
+        """
+        self.key_bindings = dict(Controls.KEY_BINDINGS)
+        self.button_bindings = dict(Controls.BUTTON_BINDINGS)
+        self.inputs = set()
+        self.held = set()
+        self.pressed = set()
+        self.released = set()
+        self.mouse_pos = (0, 0)
+
+    def bind(self, action, keys=(), buttons=()):
+        """
+        Replaces every binding of action
+        with given keys and mouse buttons.
+
+        Parameters
+        ----------
+        action : str (one of ACTIONS)
+        keys : (int, ...) (pygame key codes)
+        buttons : (int, ...) (mouse buttons, 1 is left)
+        """
+        if action not in Controls.ACTIONS:
+            raise ValueError(f'unknown action {action}')
+        for bindings, codes in ((self.key_bindings, keys),
+                                (self.button_bindings, buttons)):
+            for code in [code for code, bound in bindings.items()
+                         if bound == action]:
+                del bindings[code]
+            for code in codes:
+                bindings[code] = action
+        self.release_all()
+
+    def bindings(self, action):
+        """
+        Returns names of keys and mouse buttons bound to action.
+
+        Parameters
+        ----------
+        action : str
+        """
+        names = [pygame.key.name(key) for key, bound
+                 in self.key_bindings.items() if bound == action]
+        names += [f'mouse {button}' for button, bound
+                  in self.button_bindings.items() if bound == action]
+        return names
+
+    def press(self, action, source):
+        """
+        Marks action as held by given key or button.
+
+        Parameters
+        ----------
+        action : str = None (ignored if None)
+        source : (str, int) (kind and code of input)
+        """
+        if action is None or source in self.inputs:
+            return
+        self.inputs.add(source)
+        if action not in self.held:
+            self.held.add(action)
+            self.pressed.add(action)
+
+    def release(self, action, source):
+        """
+        Releases action, unless another input still holds it.
+
+        Parameters
+        ----------
+        action : str = None (ignored if None)
+        source : (str, int) (kind and code of input)
+        """
+        if source not in self.inputs:
+            return
+        self.inputs.discard(source)
+        if action is None or action not in self.held:
+            return
+        for kind, code in self.inputs:
+            bindings = (self.key_bindings if kind == 'key'
+                        else self.button_bindings)
+            if bindings.get(code) == action:
+                return
+        self.held.discard(action)
+        self.released.add(action)
+
+    def key_down(self, key):
+        """
+        Handles pressed key.
+
+        Parameters
+        ----------
+        key : int (pygame key code)
+        """
+        self.press(self.key_bindings.get(key), ('key', key))
+
+    def key_up(self, key):
+        """
+        Handles released key.
+
+        Parameters
+        ----------
+        key : int (pygame key code)
+        """
+        self.release(self.key_bindings.get(key), ('key', key))
+
+    def button_down(self, button):
+        """
+        Handles pressed mouse button.
+
+        Parameters
+        ----------
+        button : int (1 is left)
+        """
+        self.press(self.button_bindings.get(button), ('button', button))
+
+    def button_up(self, button):
+        """
+        Handles released mouse button.
+
+        Parameters
+        ----------
+        button : int (1 is left)
+        """
+        self.release(self.button_bindings.get(button), ('button', button))
+
+    def release_all(self):
+        """
+        Releases every input, e.g. when window loses focus.
+        """
+        self.inputs.clear()
+        self.released |= self.held
+        self.held.clear()
+
+    def consume(self, action):
+        """
+        Returns True if action was pressed since the last tick
+        and removes the press, so it is handled only once.
+
+        Parameters
+        ----------
+        action : str
+        """
+        if action in self.pressed:
+            self.pressed.discard(action)
+            return True
+        return False
+
+    def set_actions(self, actions, mouse_pos):
+        """
+        Replaces held actions, e.g. by scripted input.
+        Pressed and released actions are derived
+        from previously held ones.
+
+        Parameters
+        ----------
+        actions : iterable (held actions)
+        mouse_pos : (int, int)
+        """
+        actions = set(actions)
+        self.inputs.clear()
+        self.pressed |= actions - self.held
+        self.released |= self.held - actions
+        self.held = actions
+        self.mouse_pos = mouse_pos
+
+    def end_tick(self):
+        """
+        Clears actions pressed and released during the tick.
+        """
+        self.pressed.clear()
+        self.released.clear()
+
+    def clear(self):
+        """
+        Releases every input without recording released actions.
+        """
+        self.inputs.clear()
+        self.held.clear()
+        self.end_tick()
+
+    @staticmethod
+    def mask(actions):
+        """
+        Returns actions as bitmask over ACTIONS.
+
+        Parameters
+        ----------
+        actions : set
+        """
+        mask = 0
+        for bit, action in enumerate(Controls.ACTIONS):
+            if action in actions:
+                mask |= 1 << bit
+        return mask
+
+    @staticmethod
+    def unmask(mask):
+        """
+        Returns set of actions from bitmask over ACTIONS.
+
+        Parameters
+        ----------
+        mask : int
+        """
+        return {action for bit, action in enumerate(Controls.ACTIONS)
+                if mask & 1 << bit}
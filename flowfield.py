@@ -0,0 +1,258 @@
+"""
+Flow field class.
+
+Shared pathfinding for all zombies: one field of directions
+towards the player is computed over a grid of the map,
+every zombie steers by looking up its cell.
+"""
+import heapq
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class FlowField():
+    """
+    Used to create flow field object.
+
+    Distances from the target cell are computed with Dijkstra
+    over 8 neighbours of every cell (diagonal steps cost sqrt(2)
+    and never cut corners of blocked cells).
+    Every cell stores unit vector towards the neighbour
+    on its shortest path. Field is rebuilt only
+    when the target moves to another cell.
+
+    With window only cells inside the window centred
+    on the target cell are searched, so cost of a build
+    does not depend on size of the map. Cells outside it
+    have no direction and zombies there go straight
+    towards the target.
+    """
+    CELL_SIZE = 32
+    # space around the camera view covered by the window (pixels)
+    MARGIN = 128
+    STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1),
+             (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+    def __init__(self, bounds, cell_size=CELL_SIZE, obstacles=(),
+                 window=None):
+        """
+        Initializes flow field object.
+
+        Parameters
+        ----------
+        bounds : pygame.Rect (area covered by the field)
+        cell_size : int
+        obstacles : (pygame.Rect, ...) (areas zombies can not enter)
+        window : (int, int) = None (size of searched area in pixels,
+                                    whole map is searched if None)
+        """
+        self.left, self.top = bounds[0], bounds[1]
+        self.cell_size = cell_size
+        self.columns = max(1, -(-bounds[2] // cell_size))
+        self.rows = max(1, -(-bounds[3] // cell_size))
+        size = self.columns * self.rows
+        self.blocked = bytearray(size)
+        self.distance = [math.inf] * size
+        self.vectors = [None] * size
+        self.reach = (self.columns, self.rows)
+        if window is not None:
+            self.reach = (-(-window[0] // (2 * cell_size)),
+                          -(-window[1] // (2 * cell_size)))
+        self.touched = []
+        self.arrays = None
+        self.neighbours = None
+        self.target = -1
+        self.builds = 0
+        for rect in obstacles:
+            self.block(rect)
+        self.link()
+
+    def block(self, rect):
+        """
+        Marks every cell overlapped by rect as blocked.
+
+        Parameters
+        ----------
+        rect : pygame.Rect or (int, int, int, int)
+        """
+        size = self.cell_size
+        x1 = max((rect[0] - self.left) // size, 0)
+        y1 = max((rect[1] - self.top) // size, 0)
+        x2 = min((rect[0] + rect[2] - 1 - self.left) // size,
+                 self.columns - 1)
+        y2 = min((rect[1] + rect[3] - 1 - self.top) // size, self.rows - 1)
+        for row in range(y1, y2 + 1):
+            for column in range(x1, x2 + 1):
+                self.blocked[row * self.columns + column] = 1
+        self.neighbours = None
+        self.target = -1
+
+    def cell(self, x, y):
+        """
+        Returns index of the cell containing position,
+        positions outside of the field use the nearest border cell.
+
+        Parameters
+        ----------
+        x : float
+        y : float
+        """
+        column = min(max(int((x - self.left) // self.cell_size), 0),
+                     self.columns - 1)
+        row = min(max(int((y - self.top) // self.cell_size), 0),
+                  self.rows - 1)
+        return row * self.columns + column
+
+    def is_blocked(self, x, y):
+        """
+        Returns True if position is inside blocked cell.
+
+        Parameters
+        ----------
+        x : float
+        y : float
+        """
+        return self.blocked[self.cell(x, y)] == 1
+
+    def link(self):
+        """
+        Creates tuple of (neighbour, cost, unit vector
+        from the neighbour back to the cell) for every free cell.
+        Tuples of numbers are not tracked by garbage collector,
+        so links of large maps do not slow down its full collections.
+        """
+        columns, rows, blocked = self.columns, self.rows, self.blocked
+        diagonal = 1 / math.sqrt(2)
+        self.neighbours = []
+        for index in range(columns * rows):
+            links = []
+            row, column = divmod(index, columns)
+            for dx, dy in FlowField.STEPS:
+                c, r = column + dx, row + dy
+                if blocked[index] or not (0 <= c < columns and 0 <= r < rows):
+                    continue
+                if blocked[r * columns + c]:
+                    continue
+                if dx and dy and (blocked[row * columns + c]
+                                  or blocked[r * columns + column]):
+                    continue
+                if dx and dy:
+                    links.append((r * columns + c, math.sqrt(2),
+                                  (-dx * diagonal, -dy * diagonal)))
+                else:
+                    links.append((r * columns + c, 1.0, (-dx, -dy)))
+            self.neighbours.append(tuple(links))
+
+    def update(self, pos):
+        """
+        Rebuilds field if position moved to another cell.
+        Returns True if field was rebuilt.
+
+        Parameters
+        ----------
+        pos : (float, float) (target position)
+        """
+        target = self.cell(*pos)
+        if target == self.target:
+            return False
+        self.target = target
+        self.build()
+        return True
+
+    def build(self):
+        """
+        Computes distance and direction of every cell
+        within window towards the target cell.
+        Only cells reached by the previous build are cleared.
+        """
+        if self.neighbours is None:
+            self.link()
+        distance, vectors = self.distance, self.vectors
+        for index in self.touched:
+            distance[index] = math.inf
+            vectors[index] = None
+        neighbours = self.neighbours
+        columns = self.columns
+        row, column = divmod(self.target, columns)
+        left, right = column - self.reach[0], column + self.reach[0]
+        top, bottom = row - self.reach[1], row + self.reach[1]
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        distance[self.target] = 0.0
+        touched = [self.target]
+        queue = [(0.0, self.target)]
+        while queue:
+            current, index = heappop(queue)
+            if current > distance[index]:
+                continue
+            row, column = divmod(index, columns)
+            if not (left <= column <= right and top <= row <= bottom):
+                continue
+            for other, cost, vector in neighbours[index]:
+                new = current + cost
+                if new < distance[other]:
+                    distance[other] = new
+                    vectors[other] = vector
+                    touched.append(other)
+                    heappush(queue, (new, other))
+
+        touched = list(set(touched))
+        if np is not None:
+            if self.arrays is None:
+                size = self.columns * self.rows
+                self.arrays = (np.zeros(size), np.zeros(size),
+                               np.zeros(size, dtype=bool))
+            array_x, array_y, reachable = self.arrays
+            reachable[self.touched] = False
+            array_x[touched], array_y[touched] = zip(
+                *[vectors[i] or (0.0, 0.0) for i in touched])
+            reachable[touched] = True
+        self.touched = touched
+        self.builds += 1
+
+    def direction(self, x, y):
+        """
+        Returns unit vector of movement from position,
+        None inside the target cell or if target is unreachable.
+
+        Parameters
+        ----------
+        x : float
+        y : float
+        """
+        index = self.cell(x, y)
+        if index == self.target:
+            return None
+        return self.vectors[index]
+
+    def directions(self, x, y):
+        """
+        Returns arrays of unit vectors of movement from positions
+        and mask of positions which have a direction
+        (same rules as direction). Requires NumPy.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+        y : numpy.ndarray
+        """
+        size = self.cell_size
+        columns = np.clip((x - self.left) // size, 0, self.columns - 1)
+        rows = np.clip((y - self.top) // size, 0, self.rows - 1)
+        index = (rows * self.columns + columns).astype(np.int64)
+        dir_x, dir_y, reachable = self.arrays
+        found = reachable[index] & (index != self.target)
+        return dir_x[index], dir_y[index], found
+
+    def stats(self):
+        """
+        Returns size of the field, number of builds
+        and number of cells reached by the last build.
+        """
+        return {'columns': self.columns, 'rows': self.rows,
+                'blocked': sum(self.blocked), 'builds': self.builds,
+                'reached': len(self.touched)}
@@ -4,9 +4,20 @@ Game class.
 Allows creation of game object.
 """
 import pygame
+import os
 import sys
+import random
+from collections import deque
 from menu import *
 from gameObjects import *
+from render import RenderQueue
+from text import TextCache
+from profiler import FrameProfiler
+from world import World
+from controls import Controls
+from audio import AudioManager
+from tilemap import TileMap, Camera
+from snapshot import WorldSnapshot
 
 
 class Game():
@@ -18,92 +29,340 @@ class Game():
     """
     WINDOW_SIZE = (1024, 512)
     FONT_NAME = 'font.ttf'
+    NUMPY_ZOMBIES = False
+    DIRTY_RECTS = False
+    TEXT_CACHE_BYTES = 4 * 1024 * 1024
+    SIMULATION_RATE = 120
+    RENDER_RATE = 120
+    MAX_FRAME_TICKS = 10
+    INTERPOLATE = False
+    PROFILE_FRAMES = 600
+    RESERVED_BULLETS = 256
+    RESERVED_ZOMBIES = 256
+    MAP_PATH = None
+    MAP_REPEAT = (1, 1)
+    # zombies follow flow field, None uses it only on maps with obstacles
+    FLOW_FIELD = None
+    # snapshot kept for rewinding (F5) every HISTORY_INTERVAL ticks
+    HISTORY_INTERVAL = 120
+    HISTORY_SIZE = 10
+    # file overwritten with the latest snapshot, for resuming after crash
+    # (relative to the current directory, like --resume)
+    AUTOSAVE_PATH = None
 
-    def __init__(self):
+    def __init__(self, headless=False, script=None, seed=None,
+                 recorder=None):
         """
         Initializes game object.
+
+        Headless game uses dummy video driver, has no audio,
+        draws nothing and is controlled by scripted input.
+
+        Parameters
+        ----------
+        headless : bool
+        script : ScriptedInput() (input used by headless game)
+        seed : int = None (seed of the first session, random if None)
+        recorder : InputRecorder() = None (records input of every tick)
         """
-        pygame.init()
-        pygame.mixer.init()
-        self.music = pygame.mixer.Sound(get_path('sounds', 'music.wav'))
-        self.lost_sound = pygame.mixer.Sound(get_path('sounds', 'lost.wav'))
-        self.music.set_volume(0.5)
-        pygame.mixer.Channel(0).play(self.music, -1)
-        pygame.mixer.Channel(0).pause()
+        self.headless = headless
+        self.script = script
+        self.recorder = recorder
+        self.seed = 0
+        self.ticks = 0
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            pygame.display.init()
+            pygame.font.init()
+        else:
+            pygame.init()
+            pygame.mixer.init()
+        self.audio = AudioManager()
+        self.audio.preload(*AudioManager.SOUNDS)
+        self.audio.play_music('music.wav', 0.5)
         self.fpsClock = pygame.time.Clock()
+        self.profiler = FrameProfiler(Game.PROFILE_FRAMES)
+        self.show_profiler = False
+        self.accumulator = 0
         self.playing = False
         self.lost = False
-        self.keys = []
-        self.mouse_buttons = [None, None, None, None, None]
-        self.mouse_pos = (0, 0)
+        self.controls = Controls()
         self.window = pygame.display.set_mode(Game.WINDOW_SIZE)
-        self.map = pygame.image.load(get_path('images', 'map.jpg'))
-        self.map_rect = self.map.get_rect()
+        Assets.load_atlas()
+        Assets.convert_all()
+        if Game.MAP_PATH is not None:
+            self.tilemap = TileMap.from_directory(get_path(Game.MAP_PATH))
+        else:
+            self.tilemap = TileMap.from_image(
+                Assets.image('images', 'map.jpg', alpha=False),
+                Game.MAP_REPEAT)
+        self.map_rect = self.tilemap.rect
+        self.camera = Camera(Game.WINDOW_SIZE, self.map_rect)
+        Bullet.load_image()
+        self.render_queue = RenderQueue(dirty_rects=Game.DIRTY_RECTS)
+        self.text_cache = TextCache(get_path(Game.FONT_NAME),
+                                    Game.TEXT_CACHE_BYTES)
+        obstacles = None
+        if Game.FLOW_FIELD or (Game.FLOW_FIELD is None
+                               and self.tilemap.obstacles):
+            obstacles = self.tilemap.obstacles
+        self.world = World(self, self.map_rect, self.tilemap.spawns,
+                           obstacles=obstacles)
+        Assets.preload(('images', 'playerRunning'), ('images', 'zombieWalk'))
         self.menu_list = [MainMenu(self), HelpMenu(self),
                           CreditsMenu(self), DeathScreen(self)]
         self.menu = self.menu_list[0]
         self.player = Player(self, (360, 360))
+        self.camera.follow(self.player.rect)
+        self.world.reserve(Game.RESERVED_ZOMBIES, Game.RESERVED_BULLETS)
+        if Game.NUMPY_ZOMBIES:
+            Zombie.enable_horde(self)
+        self.history = deque(maxlen=Game.HISTORY_SIZE)
+        self.initial_state = WorldSnapshot.capture(self)
+        self.start_session(seed)
 
     def game_loop(self):
         """
         Function for running game, starts the main loop.
+
+        Runs as many fixed simulation ticks (SIMULATION_RATE per second)
+        as fit in the time elapsed since the previous frame,
+        then renders one frame (at most RENDER_RATE per second).
         """
-        self.fpsClock.tick(120)
+        elapsed = self.fpsClock.tick(Game.RENDER_RATE)
+        self.profiler.begin_frame()
         self.check_events()
+        self.profiler.mark('events')
 
         if not self.playing:
-            pygame.mixer.Channel(0).pause()
+            self.audio.pause_music()
+            self.render_queue.invalidate()
             self.menu.display_menu()
+            self.fpsClock.tick()
+            self.accumulator = 0
         else:
-            pygame.mixer.Channel(0).unpause()
+            self.audio.unpause_music()
             self.check_controls()
-            self.window.blit(self.map, self.map_rect)
 
-            self.player.update()
-            Entity.drawAll()
-            pygame.display.flip()
+            tick_time = 1000 / Game.SIMULATION_RATE
+            self.accumulator += elapsed
+            ticks = 0
+            while self.accumulator >= tick_time and not self.lost:
+                self.step()
+                self.accumulator -= tick_time
+                ticks += 1
+                if ticks == Game.MAX_FRAME_TICKS:
+                    self.accumulator = 0
+
+            if Game.INTERPOLATE:
+                self.draw(self.accumulator / tick_time)
+            else:
+                self.draw()
+            self.profiler.end_frame(elapsed / 1000, ticks,
+                                    Zombie.count(self.world),
+                                    len(self.world.bullets))
 
             if self.lost:
-                pygame.mixer.Channel(0).pause()
-                pygame.mixer.Channel(3).play(self.lost_sound)
+                if self.recorder is not None:
+                    self.recorder.save(self)
+                self.audio.pause_music()
+                self.audio.play('lost.wav')
                 self.menu = self.menu_list[3]
                 self.playing = False
 
+    def update(self):
+        """
+        Advances simulation by one tick.
+        """
+        world = self.world
+        if Game.INTERPOLATE:
+            Entity.save_positions(world)
+            Bullet.save_positions(world)
+        self.player.update()
+        self.profiler.mark('player')
+        Bullet.move(world)
+        self.profiler.mark('bullets')
+        if Zombie.collide(world):
+            self.profiler.mark('collision')
+            Zombie.move(world)
+            self.profiler.mark('move')
+        self.camera.follow(self.player.rect)
+        self.ticks += 1
+
+    def step(self):
+        """
+        Applies scripted input, records input
+        and advances simulation by one tick.
+        """
+        if self.script is not None:
+            self.script.apply(self, self.ticks)
+        if self.recorder is not None:
+            self.recorder.capture(self)
+        self.update()
+        self.controls.end_tick()
+        if Game.HISTORY_SIZE and self.ticks % Game.HISTORY_INTERVAL == 0:
+            self.save_history()
+
+    def save_history(self):
+        """
+        Adds snapshot of the game to rewind history
+        and writes it to autosave file.
+        """
+        snapshot = WorldSnapshot.capture(self)
+        self.history.append(snapshot)
+        if Game.AUTOSAVE_PATH is not None:
+            snapshot.save(Game.AUTOSAVE_PATH)
+
+    def rewind(self):
+        """
+        Restores the latest snapshot from rewind history,
+        every call goes HISTORY_INTERVAL ticks further back.
+        Disabled while recording, the recording would not replay.
+        """
+        if self.history and self.recorder is None:
+            self.history.pop().restore(self)
+            self.render_queue.invalidate()
+
+    def resume(self, path):
+        """
+        Restores game saved in snapshot file.
+
+        Parameters
+        ----------
+        path : str
+        """
+        WorldSnapshot.load(path).restore(self)
+        self.history.clear()
+        self.menu.options[0] = 'Resume'
+
+    def start_session(self, seed=None):
+        """
+        Seeds random generator of the simulation
+        and starts new recording.
+
+        Parameters
+        ----------
+        seed : int = None (random if None)
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.world.rng.seed(seed)
+        if self.recorder is not None:
+            self.recorder.start(seed)
+
+    def run(self, max_ticks):
+        """
+        Runs simulation as fast as possible,
+        until player loses or given number of ticks passes.
+        Returns number of ticks run.
+
+        Parameters
+        ----------
+        max_ticks : int
+        """
+        self.playing = True
+        start = self.ticks
+        while not self.lost and self.ticks - start < max_ticks:
+            self.step()
+        return self.ticks - start
+
+    def draw(self, alpha=1.0):
+        """
+        Draws current state of the game.
+
+        Parameters
+        ----------
+        alpha : float (fraction of tick passed since last update,
+                       used to interpolate positions)
+        """
+        if self.camera.moved:
+            self.render_queue.invalidate()
+            self.camera.moved = False
+        self.tilemap.draw(self.render_queue, self.camera)
+        Bullet.drawAll(self.world, alpha)
+        Entity.drawAll(self.world, alpha)
+        if self.show_profiler:
+            self.profiler.draw_overlay(self, RenderQueue.HUD)
+        self.profiler.mark('draw')
+        self.render_queue.present(self.window)
+        self.profiler.mark('present')
+
+    def quit(self):
+        """
+        Saves recording of the session, if any,
+        and exits the game.
+        """
+        if self.recorder is not None and self.recorder.ticks:
+            self.recorder.save(self)
+        sys.exit()
+
     def check_controls(self):
         """
-        Checks if ESC is pressed,
+        Checks if pause (ESC) is pressed,
         switches between game and menu.
+        Profiler (F3) toggles performance overlay,
+        dump profile (F4) saves profiler data
+        to profile.json and profile.csv,
+        rewind (F5) goes back in time.
         """
-        if pygame.K_ESCAPE in self.keys:
+        if self.controls.consume('pause'):
             self.playing = False
-            self.keys.remove(pygame.K_ESCAPE)
+        if self.controls.consume('profiler'):
+            self.show_profiler = not self.show_profiler
+            self.render_queue.invalidate()
+        if self.controls.consume('dump_profile'):
+            self.profiler.dump_json(get_path('profile.json'))
+            self.profiler.dump_csv(get_path('profile.csv'))
+        if self.controls.consume('rewind'):
+            self.rewind()
 
     def check_events(self):
         """
-        Registers pressed keys,
-        mouse buttons and mouse position.
+        Handles all pending events.
         """
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                self.keys.append(event.key)
-            if event.type == pygame.KEYUP:
-                if event.key in self.keys:
-                    self.keys.remove(event.key)
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button <= 5:
-                    self.mouse_buttons[event.button - 1] = event.pos
-            if event.type == pygame.MOUSEBUTTONUP:
-                if event.button <= 5:
-                    self.mouse_buttons[event.button - 1] = None
-            if event.type == pygame.MOUSEMOTION:
-                self.mouse_pos = event.pos
+            self.handle_event(event)
+
+    def handle_event(self, event):
+        """
+        Passes keys, mouse buttons and mouse position to controls.
+        Passes pressed keys to current menu
+        while game is not playing.
+        Releases everything when window loses focus,
+        so that no key stays held.
+
+        Parameters
+        ----------
+        event : pygame.event.Event
+        """
+        if event.type == pygame.QUIT:
+            self.quit()
+        if event.type == pygame.KEYDOWN:
+            if self.playing:
+                self.controls.key_down(event.key)
+            else:
+                self.menu.on_key(event.key)
+        if event.type == pygame.KEYUP:
+            self.controls.key_up(event.key)
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.controls.button_down(event.button)
+        if event.type == pygame.MOUSEBUTTONUP:
+            self.controls.button_up(event.button)
+        if event.type == pygame.MOUSEMOTION:
+            self.controls.mouse_pos = event.pos
+        if event.type == pygame.WINDOWFOCUSLOST:
+            self.controls.release_all()
+        if event.type == pygame.VIDEOEXPOSE:
+            self.menu.redraw = True
 
     def draw_text(self, text: str, size: int, position: tuple[int, int],
-                  color: tuple[int, int, int] = (255, 255, 255)):
+                  color: tuple[int, int, int] = (255, 255, 255),
+                  layer: int = None, anchor: str = 'center'):
         """
-        Draws text to the game window.
+        Draws text to the game window,
+        or adds it to given render queue layer (e.g. HUD).
 
         Parameters
         ----------
@@ -111,23 +370,26 @@ class Game():
         size : int
         position : (int, int)
         color : (int, int, int) = (255, 255, 255)
+        layer : int = None
+        anchor : str = 'center' (rect attribute placed at position)
         """
-        font = pygame.font.Font(get_path(Game.FONT_NAME), size)
-        text_surface = font.render(text, True, color)
+        text_surface = self.text_cache.render(text, size, color)
         text_rect = text_surface.get_rect()
-        text_rect.center = position
-        self.window.blit(text_surface, text_rect)
+        setattr(text_rect, anchor, position)
+        if layer is None:
+            self.window.blit(text_surface, text_rect)
+        else:
+            self.render_queue.add(layer, text_surface, text_rect)
 
     def reset(self):
         """
-        Sets game variables to default.
+        Sets game variables to default
+        by restoring snapshot taken at startup.
         """
         self.lost = False
         self.playing = False
-        self.keys.clear()
-        self.mouse_buttons = [None, None, None, None, None]
-        Zombie.reset()
-        Bullet.reset()
-        self.player.__init__(self, (360, 360))
+        self.initial_state.restore(self)
+        self.history.clear()
+        self.start_session()
         self.menu = self.menu_list[0]
         self.menu.options[0] = 'Start Game'
@@ -8,7 +8,10 @@ and for loading animations from files.
 import pygame
 import os
 import math
-from random import randint
+from operator import attrgetter
+from horde import Horde
+from render import RenderQueue
+from atlas import SpriteAtlas
 
 
 def get_path(*args):
@@ -30,7 +33,7 @@ def load_animation(flip=False, *path):
     image_list = []
     full_path = get_path(*path)
 
-    for file in os.listdir(full_path):
+    for file in sorted(os.listdir(full_path)):
         if file.endswith(".png"):
             image = pygame.image.load(os.path.join(full_path, file))
             if flip:
@@ -40,12 +43,281 @@ def load_animation(flip=False, *path):
     return image_list
 
 
+class Assets():
+    """
+    Process-wide cache of loaded images and animations.
+
+    Every file is read from disk once,
+    entities receive shared references to the same surfaces.
+    Surfaces are converted to display format,
+    so blitting them never converts pixels.
+
+    Sprites listed in BAKED are packed into one atlas texture
+    together with flipped (FLIPPED) and rotated (ROTATED) variants,
+    so drawing a sprite facing any direction is a lookup.
+    Atlas is read from disk if it was baked with bake.py,
+    otherwise it is packed at startup.
+    """
+    ATLAS = ('images', 'atlas')
+    BAKED = (('images', 'playerRunning'), ('images', 'zombieWalk'),
+             ('images', 'bullet.png'))
+    FLIPPED = (('images', 'playerRunning'), ('images', 'zombieWalk'))
+    ROTATED = (('images', 'bullet.png'),)
+    ROTATIONS = 16
+    animations = {}
+    images = {}
+    rotated = {}
+    atlas = None
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def display_format(image, alpha=True):
+        """
+        Returns copy of image in display format,
+        the image itself if display is not created yet.
+
+        Parameters
+        ----------
+        image : pygame.Surface
+        alpha : bool (keeps per-pixel alpha)
+        """
+        if pygame.display.get_surface() is None:
+            return image
+        return image.convert_alpha() if alpha else image.convert()
+
+    @classmethod
+    def animation(cls, *path):
+        """
+        Returns animation frames from specified path
+        as a pair of tuples (flipped, unflipped),
+        which can be indexed with entity facing.
+
+        Parameters
+        ----------
+        path : str (path parts relative to game directory)
+        """
+        frames = cls.animations.get(path)
+        if frames is None:
+            cls.misses += 1
+            frames = cls.load(*path)
+        else:
+            cls.hits += 1
+        return frames
+
+    @classmethod
+    def load(cls, *path):
+        """
+        Loads animation from atlas or disk and stores it in cache.
+
+        Parameters
+        ----------
+        path : str (path parts relative to game directory)
+        """
+        prefix = '/'.join(path) + '/'
+        names = cls.atlas.names(prefix) if cls.atlas is not None else ()
+        if names:
+            unflipped = tuple(cls.atlas.frame(name) for name in names)
+            flipped = tuple(cls.atlas.variant(name, 'flip')
+                            or pygame.transform.flip(image, True, False)
+                            for name, image in zip(names, unflipped))
+        else:
+            unflipped = tuple(cls.display_format(image)
+                              for image in load_animation(False, *path))
+            flipped = tuple(pygame.transform.flip(image, True, False)
+                            for image in unflipped)
+        cls.animations[path] = (flipped, unflipped)
+        return cls.animations[path]
+
+    @classmethod
+    def image(cls, *path, alpha=True):
+        """
+        Returns single image from specified path.
+
+        Parameters
+        ----------
+        path : str (path parts relative to game directory)
+        alpha : bool (False for opaque images, e.g. map)
+        """
+        image = cls.images.get(path)
+        if image is not None:
+            cls.hits += 1
+            return image
+
+        cls.misses += 1
+        name = '/'.join(path)
+        if cls.atlas is not None and name in cls.atlas:
+            image = cls.atlas.frame(name)
+        else:
+            image = cls.display_format(pygame.image.load(get_path(*path)),
+                                       alpha)
+        cls.images[path] = image
+        return image
+
+    @classmethod
+    def rotations(cls, *path):
+        """
+        Returns rotated variants of image from specified path
+        as tuple of (image, offset) pairs. Variant i is rotated
+        counterclockwise by i * 360 / ROTATIONS degrees, offset
+        moves its top left corner so that centers of rotated
+        and unrotated image match.
+
+        Parameters
+        ----------
+        path : str (path parts relative to game directory)
+        """
+        frames = cls.rotated.get(path)
+        if frames is not None:
+            cls.hits += 1
+            return frames
+
+        image = cls.image(*path)
+        name = '/'.join(path)
+        width, height = image.get_size()
+        frames = []
+        for i in range(cls.ROTATIONS):
+            rotated = None
+            if cls.atlas is not None:
+                rotated = cls.atlas.variant(name, f'rot{i}')
+            if rotated is None:
+                rotated = pygame.transform.rotate(image,
+                                                  i * 360 / cls.ROTATIONS)
+            frames.append((rotated,
+                           ((width - rotated.get_width()) // 2,
+                            (height - rotated.get_height()) // 2)))
+        cls.rotated[path] = tuple(frames)
+        return cls.rotated[path]
+
+    @classmethod
+    def preload(cls, *paths):
+        """
+        Loads given animations ahead of time,
+        so that spawning entities never touches the disk.
+
+        Parameters
+        ----------
+        paths : (str, ...) (path of every animation)
+        """
+        for path in paths:
+            if path not in cls.animations:
+                cls.load(*path)
+
+    @classmethod
+    def convert_all(cls):
+        """
+        Converts every cached surface to display format.
+        Has to be called after the display is created
+        and before entities take references to frames.
+        """
+        for path, (flipped, unflipped) in cls.animations.items():
+            cls.animations[path] = (
+                tuple(cls.display_format(image) for image in flipped),
+                tuple(cls.display_format(image) for image in unflipped))
+        for path, image in cls.images.items():
+            cls.images[path] = cls.display_format(
+                image, image.get_flags() & pygame.SRCALPHA != 0)
+
+    @classmethod
+    def load_atlas(cls):
+        """
+        Loads baked atlas if it exists,
+        packs sprites into new atlas otherwise.
+        Returns True if baked atlas was loaded.
+        """
+        path = get_path(*cls.ATLAS)
+        baked = os.path.exists(path + '.json')
+        if baked:
+            cls.atlas = SpriteAtlas.load(path)
+        else:
+            cls.atlas = SpriteAtlas.pack(cls.sprites())
+            cls.atlas.convert()
+        cls.invalidate()
+        return baked
+
+    @classmethod
+    def sprites(cls):
+        """
+        Loads every image listed in BAKED from disk
+        and creates its variants.
+        Returns dict of frame names and images.
+        """
+        images = {}
+        for path in cls.BAKED:
+            full_path = get_path(*path)
+            if os.path.isdir(full_path):
+                files = [path + (file,) for file in sorted(os.listdir(
+                         full_path)) if file.endswith(".png")]
+            else:
+                files = [path]
+
+            for file in files:
+                name = '/'.join(file)
+                image = pygame.image.load(get_path(*file))
+                images[name] = image
+                if path in cls.FLIPPED:
+                    images[name + ':flip'] = pygame.transform.flip(
+                        image, True, False)
+                if path in cls.ROTATED:
+                    for i in range(cls.ROTATIONS):
+                        images[name + f':rot{i}'] = pygame.transform.rotate(
+                            image, i * 360 / cls.ROTATIONS)
+        return images
+
+    @classmethod
+    def bake(cls):
+        """
+        Packs sprites and their variants into atlas
+        and saves it next to the other images.
+        Returns the atlas.
+        """
+        atlas = SpriteAtlas.pack(cls.sprites())
+        atlas.save(get_path(*cls.ATLAS))
+        return atlas
+
+    @classmethod
+    def invalidate(cls, *path):
+        """
+        Removes animation or image from cache,
+        clears whole cache if no path is given.
+
+        Parameters
+        ----------
+        path : str (path parts relative to game directory)
+        """
+        if path:
+            cls.animations.pop(path, None)
+            cls.images.pop(path, None)
+            cls.rotated.pop(path, None)
+        else:
+            cls.animations.clear()
+            cls.images.clear()
+            cls.rotated.clear()
+
+    @classmethod
+    def stats(cls):
+        """
+        Returns cache statistics.
+        """
+        return {'animations': len(cls.animations),
+                'images': len(cls.images),
+                'rotations': len(cls.rotated),
+                'atlas': cls.atlas is not None,
+                'hits': cls.hits, 'misses': cls.misses}
+
+
 class Entity():
     """
     Base class for other classes
     to inherit from.
+
+    Entities use __slots__ instead of __dict__
+    to keep memory per entity small.
+    Drawn entities are kept in world.entities.
     """
-    Entities = []
+    __slots__ = ('game', 'rect', 'x', 'y', 'prev_x', 'prev_y',
+                 'speed', 'facing', 'entity_index')
+    layer = RenderQueue.ZOMBIES
 
     def __init__(self, game, pos):
         """
@@ -57,13 +329,72 @@ class Entity():
         pos : (int, int)
         """
         self.game = game
-        self.image = pygame.Surface((10, 10))
-        self.rect = self.image.get_rect()
+        self.rect = pygame.Rect(0, 0, 10, 10)
         self.x, self.y = pos
+        self.prev_x, self.prev_y = pos
         self.speed = 1
         self.rect.topleft = (self.x, self.y)
         self.facing = 1  # right
-        Entity.Entities.append(self)
+        self.entity_index = -1
+
+    @classmethod
+    def add(cls, entity):
+        """
+        Adds entity to the list of drawn entities.
+
+        Parameters
+        ----------
+        entity : Entity()
+        """
+        entities = entity.game.world.entities
+        entity.entity_index = len(entities)
+        entities.append(entity)
+
+    @classmethod
+    def add_many(cls, world, entities):
+        """
+        Adds entities to the list of drawn entities of the world.
+
+        Parameters
+        ----------
+        world : World()
+        entities : list (Entity objects)
+        """
+        drawn = world.entities
+        for index, entity in enumerate(entities, len(drawn)):
+            entity.entity_index = index
+        drawn.extend(entities)
+
+    @classmethod
+    def remove(cls, entity):
+        """
+        Removes entity from the list of drawn entities
+        by swapping it with the last one.
+
+        Parameters
+        ----------
+        entity : Entity()
+        """
+        entities = entity.game.world.entities
+        index = entity.entity_index
+        last = entities.pop()
+        if last is not entity:
+            entities[index] = last
+            last.entity_index = index
+        entity.entity_index = -1
+
+    @classmethod
+    def reset(cls, world):
+        """
+        Removes every entity.
+
+        Parameters
+        ----------
+        world : World()
+        """
+        for entity in world.entities:
+            entity.entity_index = -1
+        world.entities.clear()
 
     def move_by(self, value):
         """
@@ -91,13 +422,60 @@ class Entity():
         self.y = pos[1]
         self.rect.topleft = (self.x, self.y)
 
+    def draw_position(self, alpha):
+        """
+        Returns position between previous
+        and current one.
+
+        Parameters
+        ----------
+        alpha : float (0 is previous position, 1 is current)
+        """
+        return (round(self.prev_x + (self.x - self.prev_x) * alpha),
+                round(self.prev_y + (self.y - self.prev_y) * alpha))
+
     @classmethod
-    def drawAll(cls):
+    def save_positions(cls, world):
         """
-        Draws all entities to game window.
+        Remembers current position of every entity,
+        used for interpolation while drawing.
+
+        Parameters
+        ----------
+        world : World()
         """
-        for entity in Entity.Entities:
-            entity.game.window.blit(entity.image, entity.rect)
+        for entity in world.entities:
+            entity.prev_x, entity.prev_y = entity.x, entity.y
+        if world.horde is not None:
+            world.horde.save_positions()
+
+    @classmethod
+    def drawAll(cls, world, alpha=1.0):
+        """
+        Adds entities visible by camera to render queue
+        of the game, in their layers.
+
+        Parameters
+        ----------
+        world : World()
+        alpha : float (interpolation between previous
+                       and current position)
+        """
+        render_queue = world.game.render_queue
+        view = world.game.camera.view
+        ox, oy = view.topleft
+        for entity in world.entities:
+            rect = entity.rect
+            if not view.colliderect(rect):
+                continue
+            if alpha >= 1:
+                x, y = rect.topleft
+            else:
+                x, y = entity.draw_position(alpha)
+            render_queue.add(entity.layer, entity.image, (x - ox, y - oy))
+
+        if world.horde is not None:
+            world.horde.draw(alpha, view)
 
 
 class Player(Entity):
@@ -105,6 +483,10 @@ class Player(Entity):
     Used to create player object.
     Inherits from Entity class.
     """
+    __slots__ = ('image_sets', 'images', 'current_image', 'image',
+                 'guns', 'gun', 'kills')
+    layer = RenderQueue.PLAYER
+
     def __init__(self, game, pos):
         """
         Initializes player object.
@@ -115,8 +497,7 @@ class Player(Entity):
         pos : (int, int)
         """
         Entity.__init__(self, game, pos)
-        self.image_sets = [load_animation(True, 'images', 'playerRunning'),
-                           load_animation(False, 'images', 'playerRunning')]
+        self.image_sets = Assets.animation('images', 'playerRunning')
         self.images = self.image_sets[self.facing]
         self.current_image = 0
         self.image = self.images[self.current_image]
@@ -126,6 +507,7 @@ class Player(Entity):
                      Gun(self.game, self, 8, 7, 1, 'machineGun.wav')]
         self.gun = self.guns[0]
         self.kills = 0
+        Entity.add(self)
 
     def update(self):
         """
@@ -138,12 +520,10 @@ class Player(Entity):
 
     def spawn_zombie(self):
         """
-        Spawns new zombie every 30 frames.
+        Spawns new zombies when spawn scheduler
+        of the world allows it.
         """
-        if Zombie.spawn_delay < 0:
-            Zombie.spawn_delay = 30
-            Zombie(self.game)
-        Zombie.spawn_delay -= 1
+        self.game.world.spawner.update()
 
     def run(self):
         """
@@ -152,20 +532,21 @@ class Player(Entity):
         """
         previous_facing = self.facing
         player_move_value = [0, 0]
+        held = self.game.controls.held
 
-        if pygame.K_w in self.game.keys:
+        if 'up' in held:
             player_move_value[1] -= 1
-        if pygame.K_s in self.game.keys:
+        if 'down' in held:
             player_move_value[1] += 1
-        if pygame.K_a in self.game.keys:
+        if 'left' in held:
             if self.facing == 1:
                 self.facing = 0
             player_move_value[0] -= 1
-        if pygame.K_d in self.game.keys:
+        if 'right' in held:
             if self.facing == 0:
                 self.facing = 1
             player_move_value[0] += 1
-        if pygame.K_LSHIFT in self.game.keys:
+        if 'sprint' in held:
             self.speed = 2
         else:
             self.speed = 1
@@ -187,14 +568,19 @@ class Player(Entity):
             if self.current_image >= len(self.images):
                 self.current_image = 0
             self.image = self.images[int(self.current_image)]
+            previous = (self.x, self.y)
             self.move_by(player_move_value)
+            field = self.game.world.flow_field
+            if field is not None and field.is_blocked(*self.rect.center):
+                self.move_to(previous)
 
 
 class Gun():
     """
     Used to create gun object.
     """
-    bullets = []
+    __slots__ = ('game', 'player', 'delay_value', 'delay',
+                 'bullet_speed', 'damage', 'sound')
 
     def __init__(self, game, player, delay, bullet_speed, damage, sound):
         """
@@ -207,7 +593,7 @@ class Gun():
         delay : int
         bullet_speed : int
         damage : int
-        sound : str (file name)
+        sound : str (file name played by game audio manager)
         """
         self.game = game
         self.player = player
@@ -215,30 +601,31 @@ class Gun():
         self.delay = delay
         self.bullet_speed = bullet_speed
         self.damage = damage
-        self.sound = pygame.mixer.Sound(get_path('sounds', sound))
+        self.sound = sound
 
     def update(self):
         """
-        Changes current weapon,
-        shoots and updates bullets.
+        Changes current weapon when its key is pressed
+        and shoots.
         """
-        if pygame.K_1 in self.game.keys:
+        pressed = self.game.controls.pressed
+        if 'weapon_1' in pressed:
             self.player.gun = self.player.guns[0]
-        if pygame.K_2 in self.game.keys:
+        if 'weapon_2' in pressed:
             self.player.gun = self.player.guns[1]
         self.shoot()
-        Bullet.update()
 
     def shoot(self):
         """
         Creates Bullet object relative to
         current delay and plays gun sound.
         """
-        if self.game.mouse_buttons[0]:
+        if 'fire' in self.game.controls.held:
             if self.delay < 0:
-                pygame.mixer.Channel(1).play(self.sound)
-                Bullet(self.game, self.player.rect.center,
-                       self.game.mouse_pos, self.bullet_speed, self.damage)
+                self.game.audio.play(self.sound)
+                aim = self.game.camera.to_world(self.game.controls.mouse_pos)
+                Bullet.fire(self.game, self.player.rect.center, aim,
+                            self.bullet_speed, self.damage)
                 self.delay = self.delay_value
         self.delay -= 1
 
@@ -246,13 +633,59 @@ class Gun():
 class Bullet():
     """
     Used to create bullet object.
+
+    Bullets are recycled by pool of the world,
+    new bullet is created with Bullet.fire().
+    Every bullet is drawn with the rotated frame
+    closest to its direction.
     """
-    bullets = []
-    image = pygame.image.load(get_path("images", "bullet.png"))
+    __slots__ = ('game', 'rect', 'x', 'y', 'prev_x', 'prev_y',
+                 'x_speed', 'y_speed', 'damage', 'frame', 'pool_index',
+                 'uid')
+    CAPACITY = 1024
+    MARGIN = 10
+    image = None
+    frames = None
 
-    def __init__(self, game, pos, m_pos, speed, damage):
+    def __init__(self):
         """
         Initializes bullet object.
+        """
+        self.game = None
+        self.rect = self.image.get_rect()
+        self.pool_index = -1
+
+    @classmethod
+    def load_image(cls):
+        """
+        Takes bullet image and its rotations from asset cache,
+        called after the display is created.
+        """
+        cls.image = Assets.image('images', 'bullet.png')
+        cls.frames = Assets.rotations('images', 'bullet.png')
+
+    @classmethod
+    def fire(cls, game, pos, m_pos, speed, damage):
+        """
+        Takes bullet from pool and sets it in motion.
+        Returns None if pool is exhausted.
+
+        Parameters
+        ----------
+        game : Game()
+        pos : (int, int)
+        m_pos : (int, int)
+        speed : int
+        damage : int
+        """
+        bullet = game.world.bullet_pool.acquire()
+        if bullet is not None:
+            bullet.setup(game, pos, m_pos, speed, damage)
+        return bullet
+
+    def setup(self, game, pos, m_pos, speed, damage):
+        """
+        Sets bullet position, direction and damage.
 
         Parameters
         ----------
@@ -263,59 +696,127 @@ class Bullet():
         damage : int
         """
         self.game = game
-        self.rect = self.image.get_rect()
+        self.uid = game.world.new_uid()
         self.x, self.y = pos
+        self.prev_x, self.prev_y = pos
         self.rect.topleft = (self.x, self.y)
         dy, dx = pos[1]-m_pos[1], m_pos[0]-pos[0]
-        r = math.hypot(dx, dy)
+        r = math.hypot(dx, dy) or 1
         self.x_speed = (dx/r) * speed
         self.y_speed = (dy/r) * speed
         self.damage = damage
-        Bullet.bullets.append(self)
+        count = len(Bullet.frames)
+        self.frame = Bullet.frames[
+            round(math.atan2(dy, dx) / math.tau * count) % count]
 
     @classmethod
-    def reset(cls):
+    def reset(cls, world):
         """
         Deletes all Bullet objects.
+
+        Parameters
+        ----------
+        world : World()
         """
-        Bullet.bullets.clear()
+        world.bullet_pool.clear()
 
     @classmethod
-    def update(cls):
+    def move(cls, world):
         """
         Updates position of bullets,
-        deletes object if outside of the window.
-        """
-        for bullet in Bullet.bullets:
+        deletes object if outside of the map.
 
+        Parameters
+        ----------
+        world : World()
+        """
+        bounds = world.game.map_rect
+        left, top = bounds.left - Bullet.MARGIN, bounds.top - Bullet.MARGIN
+        right = bounds.right + Bullet.MARGIN
+        bottom = bounds.bottom + Bullet.MARGIN
+        bullets = world.bullets
+        for i in range(len(bullets) - 1, -1, -1):
+            bullet = bullets[i]
             bullet.x += bullet.x_speed
             bullet.y -= bullet.y_speed
             bullet.rect.topleft = (bullet.x, bullet.y)
 
-            if 1500 < bullet.x or bullet.x < -10 or \
-               1500 < bullet.y or bullet.y < -10:
-                Bullet.bullets.remove(bullet)
+            if right < bullet.x or bullet.x < left or \
+               bottom < bullet.y or bullet.y < top:
+                world.bullet_pool.release(bullet)
 
-        Zombie.update()
-        Bullet.drawAll()
+    def draw_position(self, alpha):
+        """
+        Returns position between previous
+        and current one.
+
+        Parameters
+        ----------
+        alpha : float (0 is previous position, 1 is current)
+        """
+        return (round(self.prev_x + (self.x - self.prev_x) * alpha),
+                round(self.prev_y + (self.y - self.prev_y) * alpha))
 
     @classmethod
-    def drawAll(cls):
+    def save_positions(cls, world):
         """
-        Draws all bullets to game window.
+        Remembers current position of every bullet,
+        used for interpolation while drawing.
+
+        Parameters
+        ----------
+        world : World()
+        """
+        for bullet in world.bullets:
+            bullet.prev_x, bullet.prev_y = bullet.x, bullet.y
+
+    @classmethod
+    def drawAll(cls, world, alpha=1.0):
+        """
+        Adds bullets visible by camera to render queue of the game.
+
+        Parameters
+        ----------
+        world : World()
+        alpha : float (interpolation between previous
+                       and current position)
         """
-        for bullet in Bullet.bullets:
-            bullet.game.window.blit(Bullet.image, bullet.rect)
+        render_queue = world.game.render_queue
+        view = world.game.camera.view
+        ox, oy = view.topleft
+        for bullet in world.bullets:
+            if not view.colliderect(bullet.rect):
+                continue
+            image, (dx, dy) = bullet.frame
+            if alpha >= 1:
+                x, y = bullet.rect.topleft
+            else:
+                x, y = bullet.draw_position(alpha)
+            render_queue.add(RenderQueue.BULLETS, image,
+                             (x + dx - ox, y + dy - oy))
 
 
 class Zombie(Entity):
     """
     Used to create zombie object.
     Inherits from Entity class.
+
+    Zombies are recycled by pool of the world,
+    new zombie is created with Zombie.spawn().
+    Animation frames are shared by all zombies,
+    every zombie stores only facing and frame number.
+
+    Zombies outside of the camera view (plus LOD_MARGIN) are far,
+    at most lod_budget of the world far zombies are updated
+    every tick, taking turns, and each catches up
+    on all ticks since its last update.
     """
-    spawns = ((240, 160), (240, 368), (784, 160), (784, 368))
-    spawn_delay = 30
-    zombies = []
+    __slots__ = ('current_image', 'hp', 'pool_index', 'uid', 'lod_tick')
+    CAPACITY = 16384
+    LOD_BUDGET = 256
+    LOD_MARGIN = 128
+    frames = None
+    SPAWN_DELAY = 30
 
     def __init__(self, game):
         """
@@ -325,71 +826,340 @@ class Zombie(Entity):
         ----------
         game : Game()
         """
-        pos = (randint(0, 720), randint(0, 720))
-        Entity.__init__(self, game, pos)
-        self.image_sets = [load_animation(True, 'images', 'zombieWalk'),
-                           load_animation(False, 'images', 'zombieWalk')]
-        self.images = self.image_sets[self.facing]
+        Entity.__init__(self, game, (0, 0))
+        Zombie.frames = Assets.animation('images', 'zombieWalk')
         self.current_image = 0
-        self.image = self.images[self.current_image]
         self.rect = self.image.get_rect()
-        self.rect.midbottom = Zombie.spawns[randint(0, 3)]
+        self.hp = 2
+        self.pool_index = -1
+        self.uid = -1
+        self.lod_tick = 0
+
+    @property
+    def image(self):
+        """
+        Returns current animation frame.
+        """
+        return Zombie.frames[self.facing][int(self.current_image)]
+
+    @classmethod
+    def spawn(cls, game, pos=None):
+        """
+        Takes zombie from pool and places it
+        at given or random spawn point.
+        Returns None if pool is exhausted.
+
+        Parameters
+        ----------
+        game : Game()
+        pos : (int, int) = None (midbottom of zombie)
+        """
+        zombie = game.world.zombie_pool.acquire(game)
+        if zombie is not None:
+            zombie.setup(game, pos)
+            Entity.add(zombie)
+        return zombie
+
+    def setup(self, game, pos=None):
+        """
+        Resets zombie state and places it
+        at given or random spawn point.
+
+        Parameters
+        ----------
+        game : Game()
+        pos : (int, int) = None (midbottom of zombie)
+        """
+        self.game = game
+        self.uid = game.world.new_uid()
+        self.speed = 1
+        self.facing = 1
+        self.current_image = 0
+        if pos is None:
+            pos = game.world.rng.choice(game.world.spawns)
+        self.rect.midbottom = pos
+        self.lod_tick = game.ticks - 1
         self.x, self.y = self.rect.topleft
+        self.prev_x, self.prev_y = self.x, self.y
         self.hp = 2
-        Zombie.zombies.append(self)
 
     @classmethod
-    def reset(cls):
+    def kill(cls, zombie):
+        """
+        Returns zombie to pool.
+
+        Parameters
+        ----------
+        zombie : Zombie()
+        """
+        Entity.remove(zombie)
+        zombie.game.world.zombie_pool.release(zombie)
+
+    @classmethod
+    def reset(cls, world):
         """
         Deletes all Zombie objects.
+
+        Parameters
+        ----------
+        world : World()
+        """
+        if world.zombies:
+            for z in world.zombies:
+                z.entity_index = -1
+            entities = [e for e in world.entities if e.entity_index != -1]
+            for index, entity in enumerate(entities):
+                entity.entity_index = index
+            world.entities[:] = entities
+        world.zombie_pool.clear()
+        world.spawn_delay = Zombie.SPAWN_DELAY
+        if world.horde is not None:
+            world.horde.clear()
+
+    @classmethod
+    def count(cls, world):
+        """
+        Returns number of live zombies.
+
+        Parameters
+        ----------
+        world : World()
         """
-        for z in Zombie.zombies:
-            Entity.Entities.remove(z)
-        Zombie.zombies.clear()
+        if world.horde is not None:
+            return len(world.horde)
+        return len(world.zombies)
 
     @classmethod
-    def update(cls):
+    def enable_horde(cls, game, enabled=True, capacity=1024):
+        """
+        Switches zombies to NumPy array storage (Horde),
+        new zombies are spawned into the horde
+        instead of creating Zombie objects.
+
+        Parameters
+        ----------
+        game : Game()
+        enabled : bool
+        capacity : int (initial size of arrays)
+        """
+        world = game.world
+        cls.reset(world)
+        if enabled:
+            world.horde = Horde(game,
+                                Assets.animation('images', 'zombieWalk'),
+                                capacity)
+        else:
+            world.horde = None
+
+    @classmethod
+    def collide(cls, world):
         """
         Checks for collision with bullet,
         reduces HP and deletes the bullet.
-        Moves every zombie.
+        Ends the game if any zombie touches the player.
+        Returns False if the game was lost.
+
+        Uses spatial grid of the world unless use_grid is False,
+        in which case every pair of objects is checked.
+
+        Parameters
+        ----------
+        world : World()
+        """
+        game = world.game
+        if world.horde is not None:
+            hit_bullets, killed = world.horde.collide(world.bullets)
+            cls.remove_hits(world, hit_bullets, [])
+            game.player.kills += killed
+            if world.horde.touching(game.player.rect):
+                game.lost = True
+                return False
+            return True
+
+        if not world.zombies:
+            return True
+        player = game.player
+
+        if world.use_grid:
+            cls.collide_grid(world)
+            touching = [z for z in world.grid.query(player.rect)
+                        if z.hp > 0]
+        else:
+            cls.collide_brute_force(world)
+            touching = [z for z in world.zombies
+                        if z.rect.colliderect(player.rect)]
+
+        if touching:
+            game.lost = True
+            return False
+        return True
+
+    @classmethod
+    def collide_brute_force(cls, world):
+        """
+        Checks every zombie against every bullet.
+
+        Parameters
+        ----------
+        world : World()
+        """
+        hit_bullets = set()
+        killed = []
+
+        for z in world.zombies:
+            for b in world.bullets:
+                if b not in hit_bullets and z.rect.colliderect(b.rect):
+                    hit_bullets.add(b)
+                    if cls.hit(z, b):
+                        killed.append(z)
+                        break
+
+        cls.remove_hits(world, hit_bullets, killed)
+
+    @classmethod
+    def collide_grid(cls, world):
+        """
+        Checks every bullet against zombies
+        from nearby cells of the zombie grid.
+
+        Every bullet hits the first live zombie it collides with,
+        which gives the same result as checking every zombie
+        against bullets in order.
+
+        Parameters
+        ----------
+        world : World()
         """
-        for z in Zombie.zombies:
-            for b in Bullet.bullets:
-                if z.rect.colliderect(b.rect):
-                    z.hp -= b.damage
-                    if z.hp <= 0:
-                        Zombie.zombies.remove(z)
-                        Entity.Entities.remove(z)
-                        z.game.player.kills += 1
-                    Bullet.bullets.remove(b)
+        hit_bullets = set()
+        killed = []
+        grid = world.grid
+        grid.rebuild(world.zombies)
 
-        cls.move()
+        for b in world.bullets:
+            for z in grid.query(b.rect):
+                if z.hp > 0:
+                    hit_bullets.add(b)
+                    if cls.hit(z, b):
+                        killed.append(z)
+                    break
+
+        cls.remove_hits(world, hit_bullets, killed)
 
     @classmethod
-    def move(cls):
+    def hit(cls, z, b):
+        """
+        Reduces zombie HP by bullet damage.
+        Returns True if zombie was killed.
+
+        Parameters
+        ----------
+        z : Zombie()
+        b : Bullet()
+        """
+        z.hp -= b.damage
+        if z.hp <= 0:
+            z.game.player.kills += 1
+            return True
+        return False
+
+    @classmethod
+    def remove_hits(cls, world, hit_bullets, killed):
+        """
+        Deletes bullets which hit zombie
+        and zombies which were killed.
+        Objects are released from the last one,
+        so that order of remaining objects is deterministic.
+
+        Parameters
+        ----------
+        world : World()
+        hit_bullets : set (bullets)
+        killed : list (zombies)
+        """
+        by_index = attrgetter('pool_index')
+        for b in sorted(hit_bullets, key=by_index, reverse=True):
+            world.bullet_pool.release(b)
+        for z in sorted(killed, key=by_index, reverse=True):
+            cls.kill(z)
+
+    @classmethod
+    def move(cls, world):
         """
         Changes position of every zombie
         relative to player position.
+        With flow field in the world zombies follow it
+        and go straight only inside the player's cell.
+        Without lod_budget in the world every zombie
+        is updated every tick.
+
+        Parameters
+        ----------
+        world : World()
         """
-        for z in Zombie.zombies:
-            if z.rect.colliderect(z.game.player.rect):
-                z.game.lost = True
-                return
+        player = world.game.player
+        field = world.flow_field
+        if field is not None:
+            field.update(player.rect.center)
+        view = None
+        if world.lod_budget is not None:
+            view = world.game.camera.view.inflate(2 * Zombie.LOD_MARGIN,
+                                                  2 * Zombie.LOD_MARGIN)
+        if world.horde is not None:
+            world.horde.move((player.x, player.y), field, world.game.ticks,
+                             view, world.lod_budget)
+            return
 
-            dy, dx = z.game.player.y-z.y, z.game.player.x-z.x
-            r = math.hypot(dx, dy)
-            value = ((dx/r), (dy/r))
+        if view is None:
+            cls.steer(world, world.zombies)
+            return
+        near = []
+        far = []
+        for z in world.zombies:
+            if view.colliderect(z.rect):
+                near.append(z)
+            else:
+                far.append(z)
+        cls.steer(world, near)
+        if far:
+            turns = -(-len(far) // world.lod_budget)
+            cls.steer(world, far[world.game.ticks % turns::turns])
+
+    @classmethod
+    def steer(cls, world, zombies):
+        """
+        Turns zombies towards the player,
+        advances their animation and moves them
+        by all ticks since their last update.
+
+        Parameters
+        ----------
+        world : World()
+        zombies : list (Zombie objects)
+        """
+        player = world.game.player
+        field = world.flow_field
+        ticks = world.game.ticks
+        frame_count = len(Zombie.frames[0]) if Zombie.frames else 0
+        for z in zombies:
+            elapsed = ticks - z.lod_tick
+            z.lod_tick = ticks
+            value = None
+            if field is not None:
+                value = field.direction(*z.rect.center)
+            if value is None:
+                dy, dx = player.y-z.y, player.x-z.x
+                r = math.hypot(dx, dy) or 1
+                value = ((dx/r), (dy/r))
 
             if value[0] < 0:
                 z.facing = 0
             else:
                 z.facing = 1
 
-            z.images = z.image_sets[z.facing]
-            z.current_image += 0.05 * z.speed
-            if z.current_image >= len(z.images):
+            z.current_image += 0.05 * z.speed * elapsed
+            if z.current_image >= frame_count:
                 z.current_image = 0
-            z.image = z.images[int(z.current_image)]
 
+            if elapsed != 1:
+                value = (value[0] * elapsed, value[1] * elapsed)
             z.move_by(value)
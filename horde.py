@@ -0,0 +1,288 @@
+"""
+Horde class.
+
+Optional zombie store keeping state of every zombie
+in contiguous NumPy arrays, so that movement, animation
+and collision checks run as batched vector operations.
+Requires NumPy.
+"""
+from render import RenderQueue
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def round_rect(values):
+    """
+    Rounds coordinates the same way pygame.Rect does
+    (halves away from zero).
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+    """
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class Horde():
+    """
+    Used to create horde object.
+
+    Stores position, speed, facing, HP and animation phase
+    of every zombie in arrays instead of Zombie objects.
+    """
+    FIELDS = ('x', 'y', 'prev_x', 'prev_y', 'speed', 'facing', 'hp',
+              'current_image', 'uid', 'lod_tick')
+    layer = RenderQueue.ZOMBIES
+
+    def __init__(self, game, frames, capacity=1024, hp=2):
+        """
+        Initializes horde object.
+
+        Parameters
+        ----------
+        game : Game()
+        frames : (tuple, tuple) (flipped and unflipped animation)
+        capacity : int (initial size of arrays)
+        hp : int (HP of spawned zombie)
+        """
+        if np is None:
+            raise ImportError('Horde requires NumPy to be installed')
+
+        self.game = game
+        self.frames = frames
+        self.frame_count = len(frames[0])
+        self.width, self.height = frames[0][0].get_size()
+        self.start_hp = hp
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.speed = np.ones(capacity)
+        self.facing = np.ones(capacity, dtype=np.int8)
+        self.hp = np.zeros(capacity, dtype=np.int32)
+        self.current_image = np.zeros(capacity)
+        self.uid = np.zeros(capacity, dtype=np.int64)
+        self.lod_tick = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self):
+        return self.count
+
+    def arrays(self):
+        """
+        Returns list of all state arrays.
+        """
+        return [getattr(self, name) for name in Horde.FIELDS]
+
+    def grow(self):
+        """
+        Doubles capacity of every array.
+        """
+        capacity = len(self.x) * 2
+        for name in Horde.FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def spawn(self, pos, speed=1):
+        """
+        Adds new zombie to the horde.
+
+        Parameters
+        ----------
+        pos : (int, int) (midbottom of zombie)
+        speed : int
+        """
+        if self.count == len(self.x):
+            self.grow()
+
+        i = self.count
+        self.x[i] = pos[0] - self.width // 2
+        self.y[i] = pos[1] - self.height
+        self.prev_x[i] = self.x[i]
+        self.prev_y[i] = self.y[i]
+        self.speed[i] = speed
+        self.facing[i] = 1
+        self.hp[i] = self.start_hp
+        self.current_image[i] = 0
+        self.uid[i] = self.game.world.new_uid()
+        self.lod_tick[i] = self.game.ticks - 1
+        self.count += 1
+
+    def clear(self):
+        """
+        Deletes all zombies.
+        """
+        self.count = 0
+
+    def save_positions(self):
+        """
+        Remembers current position of every zombie,
+        used for interpolation while drawing.
+        """
+        self.prev_x[:self.count] = self.x[:self.count]
+        self.prev_y[:self.count] = self.y[:self.count]
+
+    def rects(self, alpha=1.0):
+        """
+        Returns left, top, right and bottom
+        of every zombie rect as integer arrays.
+
+        Parameters
+        ----------
+        alpha : float (interpolation between previous
+                       and current position)
+        """
+        x, y = self.x[:self.count], self.y[:self.count]
+        if alpha < 1:
+            prev_x, prev_y = self.prev_x[:self.count], self.prev_y[:self.count]
+            x = prev_x + (x - prev_x) * alpha
+            y = prev_y + (y - prev_y) * alpha
+        left = round_rect(x)
+        top = round_rect(y)
+        return left, top, left + self.width, top + self.height
+
+    def collide(self, bullets):
+        """
+        Checks every bullet against all zombies,
+        reduces HP and deletes killed zombies.
+        Returns list of bullets which hit a zombie
+        and number of killed zombies.
+
+        Parameters
+        ----------
+        bullets : list (Bullet objects)
+        """
+        if not self.count or not bullets:
+            return [], 0
+
+        left, top, right, bottom = self.rects()
+        hp = self.hp[:self.count]
+        hit_bullets = []
+
+        for b in bullets:
+            r = b.rect
+            mask = ((left < r.right) & (r.left < right) &
+                    (top < r.bottom) & (r.top < bottom) & (hp > 0))
+            hit = np.flatnonzero(mask)
+            if len(hit):
+                hp[hit[0]] -= b.damage
+                hit_bullets.append(b)
+
+        killed = int(np.count_nonzero(hp <= 0))
+        if killed:
+            self.compact(hp > 0)
+        return hit_bullets, killed
+
+    def compact(self, keep):
+        """
+        Removes zombies not selected by keep mask.
+
+        Parameters
+        ----------
+        keep : numpy.ndarray (bool mask of live zombies)
+        """
+        remaining = int(np.count_nonzero(keep))
+        for array in self.arrays():
+            array[:remaining] = array[:self.count][keep]
+        self.count = remaining
+
+    def touching(self, rect):
+        """
+        Returns True if any zombie collides with rect.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+        """
+        if not self.count:
+            return False
+        left, top, right, bottom = self.rects()
+        return bool(np.any((left < rect.right) & (rect.left < right) &
+                           (top < rect.bottom) & (rect.top < bottom)))
+
+    def move(self, target, field=None, ticks=0, view=None, budget=None):
+        """
+        Moves every zombie towards target
+        and advances its animation.
+        With flow field zombies follow its directions
+        and go straight only inside the target cell.
+        With budget zombies outside of view are far,
+        at most budget of them are moved in turns.
+        Every moved zombie is moved by all ticks since its last move.
+
+        Parameters
+        ----------
+        target : (float, float)
+        field : FlowField() = None
+        ticks : int (current tick)
+        view : pygame.Rect = None (area of near zombies)
+        budget : int = None (far zombies moved per tick)
+        """
+        index = slice(0, self.count)
+        if budget is not None and self.count:
+            left, top, right, bottom = self.rects()
+            near = ((right > view.left) & (left < view.right)
+                    & (bottom > view.top) & (top < view.bottom))
+            far = np.flatnonzero(~near)
+            if len(far):
+                turns = -(-len(far) // budget)
+                index = np.concatenate((np.flatnonzero(near),
+                                        far[ticks % turns::turns]))
+        step = self.speed[index] * (ticks - self.lod_tick[index])
+        self.lod_tick[index] = ticks
+
+        x, y = self.x[index], self.y[index]
+        dx = target[0] - x
+        dy = target[1] - y
+        r = np.hypot(dx, dy)
+        r[r == 0] = 1
+        dx /= r
+        dy /= r
+        if field is not None:
+            fx, fy, found = field.directions(x + self.width / 2,
+                                             y + self.height / 2)
+            dx[found] = fx[found]
+            dy[found] = fy[found]
+
+        self.facing[index] = dx >= 0
+        frame = self.current_image[index] + 0.05 * step
+        frame[frame >= self.frame_count] = 0
+        self.current_image[index] = frame
+
+        self.x[index] = x + dx * step
+        self.y[index] = y + dy * step
+
+    def draw(self, alpha=1.0, view=None):
+        """
+        Adds zombies inside view to render queue of the game,
+        in window coordinates.
+
+        Parameters
+        ----------
+        alpha : float (interpolation between previous
+                       and current position)
+        view : pygame.Rect = None (visible part of the map,
+                                   everything is drawn if None)
+        """
+        left, top, right, bottom = self.rects(alpha)
+        facing = self.facing[:self.count]
+        images = self.current_image[:self.count].astype(np.int64)
+        if view is not None:
+            visible = ((right > view.left) & (left < view.right)
+                       & (bottom > view.top) & (top < view.bottom))
+            left = left[visible] - view.left
+            top = top[visible] - view.top
+            facing = facing[visible]
+            images = images[visible]
+
+        frames = self.frames
+        self.game.render_queue.extend(
+            self.layer,
+            [(frames[f][i], (lx, ty)) for f, i, lx, ty in
+             zip(facing.tolist(), images.tolist(),
+                 left.tolist(), top.tolist())])
@@ -1,10 +1,123 @@
 """
 Main file used for starting the game.
+
+Example:
+python main.py --record session.rpl
+python main.py --replay session.rpl
+python main.py --autosave autosave.sav
+python main.py --resume autosave.sav
+python main.py --server --port 5555
+python main.py --connect 127.0.0.1:5555
+python main.py --spawn-curve exponential --spawn-selection offscreen
 """
+import argparse
+import asyncio
 from game import Game
+from replay import InputRecorder, Replay
+from server import GameServer
+from client import GameClient
+from spawner import SpawnScheduler
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Start the game.')
+    parser.add_argument('--record', metavar='PATH',
+                        help='save input of the session to file')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='play recorded session in headless game')
+    parser.add_argument('--seed', type=int,
+                        help='seed of the first session')
+    parser.add_argument('--autosave', metavar='PATH',
+                        help='save snapshot of the game every second')
+    parser.add_argument('--resume', metavar='PATH',
+                        help='continue game saved in snapshot file')
+    parser.add_argument('--server', action='store_true',
+                        help='run headless game server')
+    parser.add_argument('--port', type=int, default=5555,
+                        help='port of the game server')
+    parser.add_argument('--connect', metavar='HOST:PORT',
+                        help='join game server')
+    parser.add_argument('--spawn-curve', choices=SpawnScheduler.CURVES,
+                        default=SpawnScheduler.CURVE,
+                        help='how spawning speeds up with every wave')
+    parser.add_argument('--spawn-selection',
+                        choices=SpawnScheduler.SELECTIONS,
+                        default=SpawnScheduler.SELECTION,
+                        help='which spawn points are preferred')
+    parser.add_argument('--soft-cap', type=int,
+                        default=SpawnScheduler.SOFT_CAP,
+                        help='zombies above which spawning slows down')
+    parser.add_argument('--hard-cap', type=int,
+                        default=SpawnScheduler.HARD_CAP,
+                        help='zombies at which spawning stops')
+    parser.add_argument('--frame-budget', type=float, metavar='MS',
+                        help='slow down spawning when frames take '
+                             'longer (milliseconds)')
+    args = parser.parse_args()
+    if args.record and args.resume:
+        parser.error('recording must start from the beginning of a game')
+    return args
+
+
+async def serve(port, seed=None):
+    """
+    Runs game server until interrupted.
+
+    Parameters
+    ----------
+    port : int
+    seed : int = None
+    """
+    server = GameServer(Game(headless=True, seed=seed),
+                        Game.SIMULATION_RATE)
+    await server.start('0.0.0.0', port)
+    print(f'Serving on port {server.port}')
+    await server.run()
+
+
+async def join(address):
+    """
+    Connects to game server and plays until disconnected.
+
+    Parameters
+    ----------
+    address : str (host:port)
+    """
+    host, port = address.rsplit(':', 1)
+    client = GameClient(Game())
+    await client.connect(host, int(port))
+    await client.run()
+
 
 if __name__ == '__main__':
-    g = Game()
+    args = parse_args()
+    SpawnScheduler.CURVE = args.spawn_curve
+    SpawnScheduler.SELECTION = args.spawn_selection
+    SpawnScheduler.SOFT_CAP = args.soft_cap
+    SpawnScheduler.HARD_CAP = args.hard_cap
+    if args.frame_budget is not None:
+        SpawnScheduler.FRAME_BUDGET = args.frame_budget / 1000
+
+    if args.server:
+        asyncio.run(serve(args.port, args.seed))
+    elif args.connect:
+        asyncio.run(join(args.connect))
+    elif args.replay:
+        replay = Replay.load(args.replay)
+        g = Game(headless=True)
+        ticks, identical = replay.play(g)
+        print(f'{ticks} of {len(replay)} ticks replayed, '
+              f'kills {g.player.kills}, '
+              f'{"identical" if identical else "different"} final state')
+    else:
+        recorder = InputRecorder(args.record) if args.record else None
+        Game.AUTOSAVE_PATH = args.autosave
+        g = Game(seed=args.seed, recorder=recorder)
+        if args.resume:
+            g.resume(args.resume)
 
-    while True:
-        g.game_loop()
+        while True:
+            g.game_loop()
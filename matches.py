@@ -0,0 +1,137 @@
+"""
+Main file used for running bot matches.
+
+Plays independent headless games with different seeds
+and bots in a pool of processes and aggregates their results.
+
+Example:
+python matches.py --matches 1000 --bots turret kiting --ticks 36000
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+from game import Game
+from bots import IdleBot, TurretBot, KitingBot
+
+BOTS = {'idle': IdleBot, 'turret': TurretBot, 'kiting': KitingBot}
+
+# headless game reused by all matches of a worker process
+game = None
+
+
+def init_worker(numpy):
+    """
+    Creates headless game of the worker process.
+
+    Parameters
+    ----------
+    numpy : bool (store zombies in Horde)
+    """
+    global game
+    Game.NUMPY_ZOMBIES = numpy
+    game = Game(headless=True)
+
+
+def play_match(match):
+    """
+    Plays one match in game of the worker process.
+    Returns dict with seed, bot, survived ticks and kills.
+
+    Parameters
+    ----------
+    match : (int, str, int) (seed, bot name, maximum ticks)
+    """
+    seed, bot, max_ticks = match
+    game.reset()
+    game.start_session(seed)
+    game.script = BOTS[bot]()
+    ticks = game.run(max_ticks)
+    return {'seed': seed, 'bot': bot, 'ticks': ticks,
+            'kills': game.player.kills, 'survived': not game.lost}
+
+
+def aggregate(results):
+    """
+    Returns statistics of kills and survival ticks for every bot.
+
+    Parameters
+    ----------
+    results : list (dicts returned by play_match)
+    """
+    summary = {}
+    for bot in sorted({result['bot'] for result in results}):
+        matches = [result for result in results if result['bot'] == bot]
+        ticks = [result['ticks'] for result in matches]
+        kills = [result['kills'] for result in matches]
+        summary[bot] = {
+            'matches': len(matches),
+            'survived': sum(result['survived'] for result in matches),
+            'ticks': {'mean': sum(ticks) / len(ticks),
+                      'min': min(ticks), 'max': max(ticks)},
+            'kills': {'mean': sum(kills) / len(kills),
+                      'min': min(kills), 'max': max(kills)}}
+    return summary
+
+
+def run_matches(matches, workers=None, numpy=False):
+    """
+    Plays matches in a pool of processes.
+    Returns results in the order of matches.
+
+    Parameters
+    ----------
+    matches : list ((seed, bot name, maximum ticks) for every match)
+    workers : int = None (number of processes, CPU count if None)
+    numpy : bool (store zombies in Horde)
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = max(1, len(matches) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=init_worker,
+                             initargs=(numpy,)) as executor:
+        return list(executor.map(play_match, matches,
+                                 chunksize=chunk_size))
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Run bot matches.')
+    parser.add_argument('--matches', type=int, default=100,
+                        help='number of matches of every bot')
+    parser.add_argument('--bots', nargs='+', choices=sorted(BOTS),
+                        default=['turret', 'kiting'])
+    parser.add_argument('--ticks', type=int, default=36000,
+                        help='maximum length of a match')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the first match')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--numpy', action='store_true',
+                        help='store zombies in NumPy arrays')
+    parser.add_argument('--output', help='save results as JSON')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    matches = [(args.seed + i, bot, args.ticks)
+               for bot in args.bots for i in range(args.matches)]
+
+    start = perf_counter()
+    results = run_matches(matches, args.workers, args.numpy)
+    elapsed = perf_counter() - start
+    summary = aggregate(results)
+
+    for bot, stats in summary.items():
+        print(f"{bot}: {stats['survived']}/{stats['matches']} survived, "
+              f"ticks mean {stats['ticks']['mean']:.0f}, "
+              f"kills mean {stats['kills']['mean']:.1f}")
+    print(f'{len(results)} matches, '
+          f'{sum(r["ticks"] for r in results) / elapsed:.0f} ticks/s')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'summary': summary, 'matches': results}, file,
+                      indent=2)
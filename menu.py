@@ -4,14 +4,19 @@ Menu classes.
 Used to create different menu screens in game.
 """
 import pygame
-import sys
 
 
 class Menu:
     """
     Base class for other menu classes
     to inherit from.
+
+    Menu is redrawn only when its state changes,
+    between redraws the menu loop waits for events.
     """
+    FPS = 30
+    EVENT_TIMEOUT = 500
+
     def __init__(self, game):
         """
         Initializes menu object.
@@ -22,6 +27,8 @@ class Menu:
         """
         self.game = game
         self.show = True
+        self.redraw = True
+        self.clock = pygame.time.Clock()
         self.mid_x = self.game.WINDOW_SIZE[0] / 2
         self.mid_y = self.game.WINDOW_SIZE[1] / 2
 
@@ -32,6 +39,40 @@ class Menu:
         self.game.window.blit(self.game.window, (0, 0))
         pygame.display.flip()
 
+    def display_menu(self):
+        """
+        Displays menu using menu loop.
+        Redraws menu at most FPS times per second
+        and only after its state has changed.
+        """
+        self.show = True
+        self.redraw = True
+
+        while self.show:
+            if self.redraw:
+                self.redraw = False
+                self.draw_menu()
+                self.draw()
+                self.clock.tick(Menu.FPS)
+
+            event = pygame.event.wait(Menu.EVENT_TIMEOUT)
+            if event.type != pygame.NOEVENT:
+                self.game.handle_event(event)
+
+    def draw_menu(self):
+        """
+        Draws content of the menu.
+        """
+
+    def on_key(self, key):
+        """
+        Handles key pressed while menu is displayed.
+
+        Parameters
+        ----------
+        key : int
+        """
+
 
 class MainMenu(Menu):
     """
@@ -50,60 +91,54 @@ class MainMenu(Menu):
         self.choice = 0
         self.options = ['Start Game', 'Help', 'Credits', 'Quit']
 
-    def check_events(self):
+    def on_key(self, key):
         """
         Handles controls in while
         main menu is displayed.
-        """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.show = False
-                if event.key in [pygame.K_UP, pygame.K_w]:
-                    if self.choice == 0:
-                        self.choice = len(self.options)-1
-                    else:
-                        self.choice -= 1
-                if event.key in [pygame.K_DOWN, pygame.K_s]:
-                    if self.choice == len(self.options)-1:
-                        self.choice = 0
-                    else:
-                        self.choice += 1
-                if event.key == pygame.K_RETURN:
-                    if self.choice == 0:
-                        self.options[0] = 'Resume'
-                        self.show = False
-                        self.game.playing = True
-                    if self.choice == 3:
-                        sys.exit()
-                    self.game.menu = self.game.menu_list[self.choice]
-                    self.show = False
 
-    def display_menu(self):
+        Parameters
+        ----------
+        key : int
         """
-        Displays main menu
-        using menu loop.
+        if key == pygame.K_ESCAPE:
+            self.show = False
+        if key in [pygame.K_UP, pygame.K_w]:
+            if self.choice == 0:
+                self.choice = len(self.options)-1
+            else:
+                self.choice -= 1
+            self.redraw = True
+        if key in [pygame.K_DOWN, pygame.K_s]:
+            if self.choice == len(self.options)-1:
+                self.choice = 0
+            else:
+                self.choice += 1
+            self.redraw = True
+        if key == pygame.K_RETURN:
+            if self.choice == 0:
+                self.options[0] = 'Resume'
+                self.show = False
+                self.game.playing = True
+            if self.choice == 3:
+                self.game.quit()
+            self.game.menu = self.game.menu_list[self.choice]
+            self.show = False
+
+    def draw_menu(self):
         """
-        self.show = True
-
-        while self.show:
-            self.check_events()
-
-            self.game.window.fill((50, 50, 50))
-            self.game.draw_text('Main Menu', 40,
-                                (self.mid_x, self.mid_y - 100), (50, 50, 255))
-
-            offset = -50
-            for i, option in enumerate(self.options):
-                color = (255, 0, 0) if i == self.choice else (255, 255, 255)
+        Draws main menu.
+        """
+        self.game.window.fill((50, 50, 50))
+        self.game.draw_text('Main Menu', 40,
+                            (self.mid_x, self.mid_y - 100), (50, 50, 255))
 
-                self.game.draw_text(option, 20,
-                                    (self.mid_x, self.mid_y + offset), color)
-                offset += 30
+        offset = -50
+        for i, option in enumerate(self.options):
+            color = (255, 0, 0) if i == self.choice else (255, 255, 255)
 
-            self.draw()
+            self.game.draw_text(option, 20,
+                                (self.mid_x, self.mid_y + offset), color)
+            offset += 30
 
 
 class CreditsMenu(Menu):
@@ -121,40 +156,33 @@ class CreditsMenu(Menu):
         """
         Menu.__init__(self, game)
 
-    def check_events(self):
+    def on_key(self, key):
         """
         Handles controls in while
         credits menu is displayed.
+
+        Parameters
+        ----------
+        key : int
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.show = False
-                    self.game.menu = self.game.menu_list[0]
+        if key == pygame.K_ESCAPE:
+            self.show = False
+            self.game.menu = self.game.menu_list[0]
 
-    def display_menu(self):
+    def draw_menu(self):
         """
-        Displays credits menu
-        using menu loop.
+        Draws credits menu.
         """
-        self.show = True
+        self.game.window.fill((50, 50, 50))
 
-        while self.show:
-            self.check_events()
-            self.game.window.fill((50, 50, 50))
-
-            self.game.draw_text('Credits', 40,
-                                (self.mid_x, self.mid_y - 100), (50, 50, 255))
-            self.game.draw_text('Made by: Mateusz Dybala', 20,
-                                (self.mid_x, self.mid_y - 50), (250, 250, 255))
-            self.game.draw_text('Art by: RgsDev', 20,
-                                (self.mid_x, self.mid_y - 20), (250, 250, 255))
-            self.game.draw_text('Sound from: freesound.org', 20,
-                                (self.mid_x, self.mid_y + 10), (250, 250, 255))
-
-            self.draw()
+        self.game.draw_text('Credits', 40,
+                            (self.mid_x, self.mid_y - 100), (50, 50, 255))
+        self.game.draw_text('Made by: Mateusz Dybala', 20,
+                            (self.mid_x, self.mid_y - 50), (250, 250, 255))
+        self.game.draw_text('Art by: RgsDev', 20,
+                            (self.mid_x, self.mid_y - 20), (250, 250, 255))
+        self.game.draw_text('Sound from: freesound.org', 20,
+                            (self.mid_x, self.mid_y + 10), (250, 250, 255))
 
 
 class HelpMenu(Menu):
@@ -172,40 +200,33 @@ class HelpMenu(Menu):
         """
         Menu.__init__(self, game)
 
-    def check_events(self):
+    def on_key(self, key):
         """
         Handles controls in while
         help menu is displayed.
+
+        Parameters
+        ----------
+        key : int
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    self.show = False
-                    self.game.menu = self.game.menu_list[0]
+        if key == pygame.K_ESCAPE:
+            self.show = False
+            self.game.menu = self.game.menu_list[0]
 
-    def display_menu(self):
+    def draw_menu(self):
         """
-        Displays help menu
-        using menu loop.
+        Draws help menu.
         """
-        self.show = True
-
-        while self.show:
-            self.check_events()
-            self.game.window.fill((50, 50, 50))
-
-            self.game.draw_text('Help', 40, (self.mid_x, self.mid_y - 100),
-                                (50, 255, 50))
-            self.game.draw_text('Kill as many zombies as you can', 20,
-                                (self.mid_x, self.mid_y - 50))
-            self.game.draw_text('Switch between weapon using 1 & 2 keys', 20,
-                                (self.mid_x, self.mid_y - 20))
-            self.game.draw_text('Press ESC to pause game', 20,
-                                (self.mid_x, self.mid_y + 10))
+        self.game.window.fill((50, 50, 50))
 
-            self.draw()
+        self.game.draw_text('Help', 40, (self.mid_x, self.mid_y - 100),
+                            (50, 255, 50))
+        self.game.draw_text('Kill as many zombies as you can', 20,
+                            (self.mid_x, self.mid_y - 50))
+        self.game.draw_text('Switch between weapon using 1 & 2 keys', 20,
+                            (self.mid_x, self.mid_y - 20))
+        self.game.draw_text('Press ESC to pause game', 20,
+                            (self.mid_x, self.mid_y + 10))
 
 
 class DeathScreen(Menu):
@@ -216,32 +237,25 @@ class DeathScreen(Menu):
     def __init__(self, game):
         Menu.__init__(self, game)
 
-    def check_events(self):
+    def on_key(self, key):
         """
         Handles controls in while
         death screen is displayed.
+
+        Parameters
+        ----------
+        key : int
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                sys.exit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    self.game.reset()
-                    self.show = False
+        if key == pygame.K_RETURN:
+            self.game.reset()
+            self.show = False
 
-    def display_menu(self):
+    def draw_menu(self):
         """
-        Displays death screen
-        using menu loop.
+        Draws death screen
+        on top of the last game frame.
         """
-        self.show = True
-
-        while self.show:
-            self.check_events()
-
-            self.game.draw_text('You Lost !', 40,
-                                (self.mid_x, self.mid_y - 100), (255, 0, 0))
-            self.game.draw_text(f'Score: {self.game.player.kills} kills',
-                                30, (self.mid_x, self.mid_y), (150, 0, 0))
-
-            self.draw()
+        self.game.draw_text('You Lost !', 40,
+                            (self.mid_x, self.mid_y - 100), (255, 0, 0))
+        self.game.draw_text(f'Score: {self.game.player.kills} kills',
+                            30, (self.mid_x, self.mid_y), (150, 0, 0))
@@ -0,0 +1,163 @@
+"""
+Network benchmark.
+
+Runs game server and simulated clients over loopback
+for every client count, reports server tick time
+and traffic per client, and checks that every client
+ends with the same state as the server.
+
+Example:
+python netbench.py --clients 1 8 32 128 --ticks 1200
+"""
+import argparse
+import asyncio
+import math
+from game import Game
+from server import GameServer
+from bench import write_results
+from network import (WELCOME, INPUT, MSG_INPUT, MSG_SNAPSHOT, read_message,
+                     write_message, capture, encode, StateMirror)
+from controls import Controls
+
+CONTROL_RATE = 10
+
+
+def parse_args():
+    """
+    Returns parsed command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Run network benchmark.')
+    parser.add_argument('--clients', type=int, nargs='+',
+                        default=[1, 8, 32, 128])
+    parser.add_argument('--ticks', type=int, default=1200)
+    parser.add_argument('--interval', type=int,
+                        default=GameServer.SNAPSHOT_INTERVAL,
+                        help='ticks between snapshots')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--numpy', action='store_true',
+                        help='store zombies in NumPy arrays')
+    parser.add_argument('--output', default='netbench_output.json')
+    return parser.parse_args()
+
+
+async def drive(writer):
+    """
+    Sends input of a player running in circles
+    and shooting around.
+
+    Parameters
+    ----------
+    writer : asyncio.StreamWriter
+    """
+    directions = ('up', 'right', 'down', 'left')
+    cx, cy = Game.WINDOW_SIZE[0] // 2, Game.WINDOW_SIZE[1] // 2
+    step = 0
+    while True:
+        actions = {'fire', 'weapon_2', directions[step // 20 % 4]}
+        angle = step / CONTROL_RATE
+        mouse = (cx + round(200 * math.cos(angle)),
+                 cy + round(200 * math.sin(angle)))
+        write_message(writer, MSG_INPUT,
+                      INPUT.pack(Controls.mask(actions), *mouse))
+        step += 1
+        await asyncio.sleep(1 / CONTROL_RATE)
+
+
+async def simulated_client(port, mirror):
+    """
+    Connects to server and applies snapshots to mirror
+    until server disconnects. Client controlling the player
+    sends scripted input.
+
+    Parameters
+    ----------
+    port : int
+    mirror : StateMirror()
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    message = await read_message(reader)
+    control = WELCOME.unpack(message[1])[3]
+    driver = asyncio.ensure_future(drive(writer)) if control else None
+    while True:
+        message = await read_message(reader)
+        if message is None:
+            break
+        if message[0] == MSG_SNAPSHOT:
+            mirror.apply(message[1])
+    if driver is not None:
+        driver.cancel()
+    writer.close()
+
+
+async def run_clients(game, clients, ticks, interval, seed):
+    """
+    Runs server with given number of simulated clients.
+    Returns dict with timings and traffic.
+
+    Parameters
+    ----------
+    game : Game() (headless game)
+    clients : int
+    ticks : int
+    interval : int (ticks between snapshots)
+    seed : int
+    """
+    game.reset()
+    game.start_session(seed)
+    server = GameServer(game, Game.SIMULATION_RATE, interval)
+    await server.start()
+    mirrors = [StateMirror() for _ in range(clients)]
+    tasks = [asyncio.ensure_future(simulated_client(server.port, mirror))
+             for mirror in mirrors]
+    while len(server.clients) < clients:
+        await asyncio.sleep(0.01)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await server.run(ticks)
+    elapsed = loop.time() - start
+    stats = server.stats()
+    await server.close()
+    await asyncio.gather(*tasks)
+
+    header, entities = server.state
+    traffic = [client['bytes'] for client in stats['clients']]
+    snapshots = [client['snapshots'] for client in stats['clients']]
+    return {'clients': clients, 'ticks': ticks, 'seconds': elapsed,
+            'tick': stats['tick'],
+            'bytes_per_client_s': sum(traffic) / clients / elapsed,
+            'snapshot_bytes': sum(traffic) / max(sum(snapshots), 1),
+            'full_snapshot_bytes': len(encode(header, {}, entities)),
+            'entities': len(capture(game)[1]),
+            'encodes': stats['encodes'],
+            'skipped': sum(c['skipped'] for c in stats['clients']),
+            'in_sync': sum(mirror.matches(header, entities)
+                           for mirror in mirrors)}
+
+
+async def main(args):
+    """
+    Runs benchmark for every client count.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+    """
+    Game.NUMPY_ZOMBIES = args.numpy
+    game = Game(headless=True)
+    results = []
+    for clients in args.clients:
+        result = await run_clients(game, clients, args.ticks,
+                                   args.interval, args.seed)
+        results.append(result)
+        print(f"{clients} clients: tick p50 {result['tick']['p50']:.3f} ms, "
+              f"p99 {result['tick']['p99']:.3f} ms, "
+              f"{result['bytes_per_client_s'] / 1024:.1f} KiB/s per client, "
+              f"snapshot {result['snapshot_bytes']:.0f} B "
+              f"(full {result['full_snapshot_bytes']} B), "
+              f"{result['in_sync']}/{clients} in sync")
+    write_results(results, args.output)
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,178 @@
+"""
+Network protocol functions and classes.
+
+Messages sent between game server and clients over TCP,
+and encoding of world state as delta-compressed snapshots.
+
+Every message starts with MESSAGE header (type and payload size).
+Client sends INPUT whenever its controls change,
+server sends WELCOME once and then SNAPSHOT every few ticks.
+Snapshot contains player state and only entities which were
+added, changed or removed since the previous snapshot
+sent to the same client, compressed with zlib.
+"""
+import asyncio
+import struct
+import zlib
+from gameObjects import Bullet
+
+MESSAGE = struct.Struct('<BI')  # type, payload size
+WELCOME = struct.Struct('<IHH?')  # client id, tick rate, interval, control
+INPUT = struct.Struct('<Hhh')  # held actions, mouse x, mouse y
+# tick, kills, player x, y, facing, frame, gun, changed, removed
+SNAPSHOT = struct.Struct('<IIhhBBBII')
+ENTITY = struct.Struct('<IBhhBB')  # uid, kind, x, y, facing, frame
+UID = struct.Struct('<I')
+
+MSG_WELCOME = 1
+MSG_INPUT = 2
+MSG_SNAPSHOT = 3
+
+ZOMBIE = 1
+BULLET = 2
+
+COMPRESSION = 1
+
+
+async def read_message(reader):
+    """
+    Returns type and payload of the next message,
+    None if connection was closed.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+    """
+    try:
+        kind, size = MESSAGE.unpack(
+            await reader.readexactly(MESSAGE.size))
+        return kind, await reader.readexactly(size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+def write_message(writer, kind, payload):
+    """
+    Writes message to stream without waiting for it to be sent.
+
+    Parameters
+    ----------
+    writer : asyncio.StreamWriter
+    kind : int (MSG_ type)
+    payload : bytes
+    """
+    writer.write(MESSAGE.pack(kind, len(payload)) + payload)
+
+
+def capture(game):
+    """
+    Returns snapshot header values (without entity counts)
+    and dict of every zombie and bullet packed in ENTITY format
+    by uid.
+
+    Parameters
+    ----------
+    game : Game()
+    """
+    world = game.world
+    player = game.player
+    header = (game.ticks, player.kills, player.rect.x, player.rect.y,
+              player.facing, int(player.current_image),
+              player.guns.index(player.gun))
+
+    pack = ENTITY.pack
+    entities = {}
+    horde = world.horde
+    if horde is not None:
+        n = horde.count
+        left, top, _, _ = horde.rects()
+        for uid, x, y, facing, frame in zip(
+                horde.uid[:n].tolist(), left.tolist(), top.tolist(),
+                horde.facing[:n].tolist(), horde.current_image[:n].tolist()):
+            entities[uid] = pack(uid, ZOMBIE, x, y, facing, int(frame))
+    for z in world.zombies:
+        entities[z.uid] = pack(z.uid, ZOMBIE, z.rect.x, z.rect.y,
+                               z.facing, int(z.current_image))
+
+    frames = {id(frame): i for i, frame in enumerate(Bullet.frames)}
+    for b in world.bullets:
+        entities[b.uid] = pack(b.uid, BULLET, b.rect.x, b.rect.y, 0,
+                               frames[id(b.frame)])
+    return header, entities
+
+
+def encode(header, previous, entities):
+    """
+    Returns compressed snapshot of entities
+    which differ from previous ones.
+
+    Parameters
+    ----------
+    header : tuple (returned by capture)
+    previous : dict (entities known by the client)
+    entities : dict (current entities)
+    """
+    changed = [record for uid, record in entities.items()
+               if previous.get(uid) != record]
+    removed = [uid for uid in previous if uid not in entities]
+    payload = b''.join((SNAPSHOT.pack(*header, len(changed), len(removed)),
+                        struct.pack(f'<{len(removed)}I', *removed),
+                        *changed))
+    return zlib.compress(payload, COMPRESSION)
+
+
+class StateMirror():
+    """
+    Used to create state mirror object.
+
+    Client copy of world state, updated by snapshots.
+    Entities are stored as unpacked ENTITY tuples by uid.
+    """
+    def __init__(self):
+        """
+        Initializes state mirror object.
+        """
+        self.header = None
+        self.entities = {}
+        self.snapshots = 0
+        self.bytes = 0
+
+    def apply(self, data):
+        """
+        Updates state with compressed snapshot.
+        Returns header, removed uids and changed entities.
+
+        Parameters
+        ----------
+        data : bytes (payload of SNAPSHOT message)
+        """
+        payload = zlib.decompress(data)
+        *header, changed, removed = SNAPSHOT.unpack_from(payload)
+        offset = SNAPSHOT.size
+        removed = struct.unpack_from(f'<{removed}I', payload, offset)
+        offset += UID.size * len(removed)
+        for uid in removed:
+            del self.entities[uid]
+        records = list(ENTITY.iter_unpack(payload[offset:]))
+        for record in records:
+            self.entities[record[0]] = record
+        self.header = tuple(header)
+        self.snapshots += 1
+        self.bytes += MESSAGE.size + len(data)
+        return self.header, removed, records
+
+    def matches(self, header, entities):
+        """
+        Returns True if mirror equals state returned by capture.
+
+        Parameters
+        ----------
+        header : tuple
+        entities : dict
+        """
+        if self.header != tuple(header):
+            return False
+        if self.entities.keys() != entities.keys():
+            return False
+        return all(ENTITY.unpack(record) == self.entities[uid]
+                   for uid, record in entities.items())
@@ -0,0 +1,133 @@
+"""
+Object pool class.
+
+Recycles game objects instead of creating
+new ones for every shot and spawn.
+"""
+
+
+class Pool():
+    """
+    Used to create object pool.
+
+    Live objects are kept in a list, every object stores
+    its position in pool_index, so releasing swaps it
+    with the last live object and costs O(1).
+    At most capacity objects are ever created.
+    """
+    def __init__(self, factory, capacity):
+        """
+        Initializes pool object.
+
+        Parameters
+        ----------
+        factory : callable (creates new object)
+        capacity : int (maximum number of objects)
+        """
+        self.factory = factory
+        self.capacity = capacity
+        self.live = []
+        self.free = []
+        self.created = 0
+        self.high_water = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.live)
+
+    def reserve(self, count, *args):
+        """
+        Creates free objects ahead of time.
+
+        Parameters
+        ----------
+        count : int
+        args : arguments passed to factory
+        """
+        while self.created < min(count, self.capacity):
+            self.free.append(self.factory(*args))
+            self.created += 1
+
+    def acquire(self, *args):
+        """
+        Returns free object marked as live,
+        None if capacity is reached.
+
+        Parameters
+        ----------
+        args : arguments passed to factory if new object is created
+        """
+        if self.free:
+            item = self.free.pop()
+        elif self.created < self.capacity:
+            item = self.factory(*args)
+            self.created += 1
+        else:
+            self.dropped += 1
+            return None
+
+        item.pool_index = len(self.live)
+        self.live.append(item)
+        if len(self.live) > self.high_water:
+            self.high_water = len(self.live)
+        return item
+
+    def acquire_many(self, count, *args):
+        """
+        Returns list of at most count free objects marked as live,
+        shorter if capacity is reached.
+
+        Parameters
+        ----------
+        count : int
+        args : arguments passed to factory if new objects are created
+        """
+        free = self.free
+        while len(free) < count and self.created < self.capacity:
+            free.append(self.factory(*args))
+            self.created += 1
+        taken = min(count, len(free))
+        self.dropped += count - taken
+        items = free[len(free) - taken:]
+        del free[len(free) - taken:]
+
+        live = self.live
+        for index, item in enumerate(items, len(live)):
+            item.pool_index = index
+        live.extend(items)
+        if len(live) > self.high_water:
+            self.high_water = len(live)
+        return items
+
+    def release(self, item):
+        """
+        Marks live object as free.
+
+        Parameters
+        ----------
+        item : object from this pool
+        """
+        index = item.pool_index
+        last = self.live.pop()
+        if last is not item:
+            self.live[index] = last
+            last.pool_index = index
+        item.pool_index = -1
+        self.free.append(item)
+
+    def clear(self):
+        """
+        Marks every live object as free.
+        """
+        for item in self.live:
+            item.pool_index = -1
+        self.free.extend(self.live)
+        self.live.clear()
+
+    def stats(self):
+        """
+        Returns pool statistics.
+        """
+        return {'capacity': self.capacity, 'live': len(self.live),
+                'free': len(self.free), 'created': self.created,
+                'high_water': self.high_water, 'dropped': self.dropped}
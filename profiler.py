@@ -0,0 +1,214 @@
+"""
+Frame profiler class.
+
+Measures time spent in every phase of a frame,
+keeps the last frames in a ring buffer
+and draws performance overlay.
+"""
+import csv
+import json
+from time import perf_counter
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """
+    Returns mean, max and given percentiles
+    of samples in milliseconds.
+
+    Parameters
+    ----------
+    samples : list (seconds)
+    points : (int, ...)
+    """
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    result = {'mean': sum(ordered) / len(ordered) * 1000,
+              'max': ordered[-1] * 1000}
+    for point in points:
+        index = min(len(ordered) - 1, round(point / 100 * (len(ordered) - 1)))
+        result[f'p{point}'] = ordered[index] * 1000
+    return result
+
+
+class FrameProfiler():
+    """
+    Used to create frame profiler object.
+
+    Time between marks is added to the named phase,
+    so a phase running several times per frame
+    (e.g. simulation ticks) is summed up.
+    """
+    PHASES = ('events', 'player', 'bullets', 'collision', 'move',
+              'draw', 'present')
+
+    def __init__(self, size=600):
+        """
+        Initializes frame profiler object.
+
+        Parameters
+        ----------
+        size : int (number of frames kept)
+        """
+        self.size = size
+        self.index = 0
+        self.frames = 0
+        self.active = False
+        self.start = 0
+        self.last = 0
+        self.current = dict.fromkeys(FrameProfiler.PHASES, 0.0)
+        self.phase_times = {phase: [0.0] * size
+                            for phase in FrameProfiler.PHASES}
+        self.frame_times = [0.0] * size
+        self.work_times = [0.0] * size
+        self.ticks = [0] * size
+        self.zombies = [0] * size
+        self.bullets = [0] * size
+        self.overlay = []
+
+    def begin_frame(self):
+        """
+        Starts measuring new frame.
+        """
+        for phase in self.current:
+            self.current[phase] = 0.0
+        self.active = True
+        self.start = self.last = perf_counter()
+
+    def mark(self, phase):
+        """
+        Adds time passed since previous mark to given phase.
+
+        Parameters
+        ----------
+        phase : str
+        """
+        if self.active:
+            now = perf_counter()
+            self.current[phase] += now - self.last
+            self.last = now
+
+    def end_frame(self, frame_time, ticks, zombies, bullets):
+        """
+        Stores measured frame in ring buffer.
+
+        Parameters
+        ----------
+        frame_time : float (seconds since previous frame)
+        ticks : int (simulation ticks run in frame)
+        zombies : int
+        bullets : int
+        """
+        if not self.active:
+            return
+        i = self.index
+        for phase, value in self.current.items():
+            self.phase_times[phase][i] = value
+        self.frame_times[i] = frame_time
+        self.work_times[i] = perf_counter() - self.start
+        self.ticks[i] = ticks
+        self.zombies[i] = zombies
+        self.bullets[i] = bullets
+        self.index = (i + 1) % self.size
+        self.frames += 1
+        self.active = False
+
+    def order(self):
+        """
+        Returns buffer indexes of stored frames,
+        from the oldest to the newest.
+        """
+        count = min(self.frames, self.size)
+        start = (self.index - count) % self.size
+        return [(start + i) % self.size for i in range(count)]
+
+    def records(self):
+        """
+        Returns stored frames as list of dicts
+        (times in milliseconds).
+        """
+        order = self.order()
+        first = self.frames - len(order)
+        rows = []
+        for number, i in enumerate(order):
+            row = {'frame': first + number,
+                   'frame_time': self.frame_times[i] * 1000,
+                   'work_time': self.work_times[i] * 1000,
+                   'ticks': self.ticks[i],
+                   'zombie_count': self.zombies[i],
+                   'bullet_count': self.bullets[i]}
+            for phase in FrameProfiler.PHASES:
+                row[phase] = self.phase_times[phase][i] * 1000
+            rows.append(row)
+        return rows
+
+    def stats(self):
+        """
+        Returns FPS and percentiles of frame time,
+        work time and every phase.
+        """
+        order = self.order()
+        frame_times = [self.frame_times[i] for i in order]
+        total = sum(frame_times)
+        return {'fps': len(frame_times) / total if total else 0.0,
+                'frame_time': percentiles(frame_times),
+                'work_time': percentiles([self.work_times[i]
+                                          for i in order]),
+                'phases': {phase: percentiles([times[i] for i in order])
+                           for phase, times in self.phase_times.items()}}
+
+    def dump_csv(self, path):
+        """
+        Saves stored frames as CSV.
+
+        Parameters
+        ----------
+        path : str
+        """
+        rows = self.records()
+        fields = (['frame', 'frame_time', 'work_time', 'ticks',
+                   'zombie_count', 'bullet_count']
+                  + list(FrameProfiler.PHASES))
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def dump_json(self, path):
+        """
+        Saves statistics and stored frames as JSON.
+
+        Parameters
+        ----------
+        path : str
+        """
+        with open(path, 'w') as file:
+            json.dump({'stats': self.stats(), 'frames': self.records()},
+                      file, indent=2)
+
+    def draw_overlay(self, game, layer, refresh=30):
+        """
+        Draws FPS, frame time percentiles
+        and entity counts in top left corner.
+
+        Parameters
+        ----------
+        game : Game()
+        layer : int (render queue layer)
+        refresh : int (number of frames between updates of the text)
+        """
+        if not self.frames:
+            return
+        if not self.overlay or self.frames % refresh == 0:
+            last = (self.index - 1) % self.size
+            stats = self.stats()
+            frame, work = stats['frame_time'], stats['work_time']
+            self.overlay = [
+                f"FPS {stats['fps']:.0f}",
+                f"frame p50 {frame['p50']:.1f} p99 {frame['p99']:.1f} ms",
+                f"work p50 {work['p50']:.1f} p99 {work['p99']:.1f} ms",
+                f"zombies {self.zombies[last]} bullets {self.bullets[last]}"]
+
+        for number, line in enumerate(self.overlay):
+            game.draw_text(line, 14, (8, 8 + number * 16), (255, 255, 0),
+                           layer, 'topleft')
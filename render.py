@@ -0,0 +1,162 @@
+"""
+Render queue class.
+
+Collects surfaces drawn during a frame into layers
+and submits every layer with a single blits call.
+Optionally updates only changed parts of the display.
+"""
+import pygame
+
+
+class RenderQueue():
+    """
+    Used to create render queue object.
+
+    Layers are drawn in order of their numbers,
+    every layer is drawn with one Surface.blits call.
+
+    In dirty rects mode MAP layer is treated as background,
+    only areas covered by sprites in previous frame are restored
+    and only areas of previous and current sprites are updated
+    on the display. Whole display is redrawn if dirty area
+    is bigger than threshold (fraction of window area).
+    """
+    MAP = 0
+    BULLETS = 1
+    ZOMBIES = 2
+    PLAYER = 3
+    HUD = 4
+    LAYERS = 5
+
+    def __init__(self, y_sort=(ZOMBIES,), dirty_rects=False, threshold=0.5):
+        """
+        Initializes render queue object.
+
+        Parameters
+        ----------
+        y_sort : (int, ...) (layers sorted by bottom edge before drawing)
+        dirty_rects : bool
+        threshold : float
+        """
+        self.layers = [[] for _ in range(RenderQueue.LAYERS)]
+        self.y_sort = set(y_sort)
+        self.dirty_rects = dirty_rects
+        self.threshold = threshold
+        self.previous = []
+        self.full_redraw = True
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def add(self, layer, surface, dest):
+        """
+        Adds surface to given layer.
+
+        Parameters
+        ----------
+        layer : int
+        surface : pygame.Surface
+        dest : pygame.Rect or (int, int)
+        """
+        self.layers[layer].append((surface, dest))
+
+    def extend(self, layer, items):
+        """
+        Adds multiple (surface, dest) pairs to given layer.
+
+        Parameters
+        ----------
+        layer : int
+        items : iterable
+        """
+        self.layers[layer].extend(items)
+
+    def clear(self):
+        """
+        Removes everything from queue.
+        """
+        for layer in self.layers:
+            layer.clear()
+
+    def invalidate(self):
+        """
+        Forces redraw of the whole display in next frame,
+        used when something else has drawn to the window.
+        """
+        self.full_redraw = True
+
+    def sprite_rects(self):
+        """
+        Returns rects of everything queued
+        outside of MAP layer.
+        """
+        rects = []
+        for layer in self.layers[RenderQueue.MAP + 1:]:
+            for surface, dest in layer:
+                rects.append(pygame.Rect(dest[0], dest[1],
+                                         surface.get_width(),
+                                         surface.get_height()))
+        return rects
+
+    def restore(self, window, rects):
+        """
+        Redraws background (MAP layer) inside given rects.
+
+        Parameters
+        ----------
+        window : pygame.Surface
+        rects : list (pygame.Rect)
+        """
+        for surface, dest in self.layers[RenderQueue.MAP]:
+            for rect in rects:
+                area = rect.move(-dest[0], -dest[1])
+                window.blit(surface, rect, area)
+
+    def present(self, window):
+        """
+        Draws queued layers and updates the display,
+        either whole or only changed areas.
+
+        Parameters
+        ----------
+        window : pygame.Surface
+        """
+        if not self.dirty_rects:
+            self.flush(window)
+            pygame.display.flip()
+            return
+
+        current = self.sprite_rects()
+        dirty = self.previous + current
+        dirty_area = sum(rect.w * rect.h for rect in dirty)
+        window_area = window.get_width() * window.get_height()
+
+        if self.full_redraw or dirty_area > self.threshold * window_area:
+            self.full_redraw = False
+            self.full_frames += 1
+            self.flush(window)
+            pygame.display.flip()
+        else:
+            self.partial_frames += 1
+            self.restore(window, self.previous)
+            self.flush(window, RenderQueue.MAP + 1)
+            pygame.display.update(dirty)
+        self.previous = current
+
+    def flush(self, window, first_layer=MAP):
+        """
+        Draws every layer to window and empties the queue.
+
+        Parameters
+        ----------
+        window : pygame.Surface
+        first_layer : int (layers below are skipped and cleared)
+        """
+        for number, layer in enumerate(self.layers):
+            if number < first_layer:
+                layer.clear()
+            if not layer:
+                continue
+            if number in self.y_sort:
+                layer.sort(key=lambda item: item[1][1] + item[0].get_height())
+            window.blits(layer, doreturn=False)
+            layer.clear()
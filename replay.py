@@ -0,0 +1,235 @@
+"""
+Input recording and replay classes.
+
+Used to save input of a game session to a compact
+binary file together with the random seed,
+and to play it back in headless game.
+"""
+import struct
+import zlib
+import hashlib
+from bots import ScriptedInput
+from controls import Controls
+from spawner import SpawnScheduler
+
+MAGIC = b'PGRP'
+VERSION = 3
+HEADER = struct.Struct('<4sHQI')  # magic, version, seed, ticks
+# spawn curve, spawn point selection, soft cap, hard cap (-1 for no cap)
+SPAWN = struct.Struct('<BBii')
+TICK = struct.Struct('<HHHhh')  # held, pressed, released, mouse x, mouse y
+DIGEST_SIZE = 16
+
+
+def state_digest(game):
+    """
+    Returns hash of simulation state,
+    equal hashes mean bit-identical games.
+
+    Parameters
+    ----------
+    game : Game()
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    player = game.player
+    digest.update(struct.pack('<IIdd', game.ticks, player.kills,
+                              player.x, player.y))
+    world = game.world
+    for z in world.zombies:
+        digest.update(struct.pack('<ddi', z.x, z.y, z.hp))
+    horde = world.horde
+    if horde is not None:
+        for field in ('x', 'y', 'hp'):
+            digest.update(getattr(horde, field)[:horde.count].tobytes())
+    for bullet in world.bullets:
+        digest.update(struct.pack('<dd', bullet.x, bullet.y))
+    return digest.digest()
+
+
+def pack_spawner(spawner):
+    """
+    Returns settings of spawn scheduler in SPAWN format.
+
+    Parameters
+    ----------
+    spawner : SpawnScheduler()
+    """
+    if callable(spawner.curve):
+        raise ValueError('session with custom spawn curve '
+                         'can not be recorded')
+    return SPAWN.pack(SpawnScheduler.CURVES.index(spawner.curve),
+                      SpawnScheduler.SELECTIONS.index(spawner.selection),
+                      -1 if spawner.soft_cap is None else spawner.soft_cap,
+                      -1 if spawner.hard_cap is None else spawner.hard_cap)
+
+
+def unpack_spawner(data, spawner):
+    """
+    Sets settings of spawn scheduler from data in SPAWN format.
+    Frame budget is turned off, it is not used while recording.
+
+    Parameters
+    ----------
+    data : bytes
+    spawner : SpawnScheduler()
+    """
+    curve, selection, soft_cap, hard_cap = SPAWN.unpack(data)
+    spawner.curve = SpawnScheduler.CURVES[curve]
+    spawner.selection = SpawnScheduler.SELECTIONS[selection]
+    spawner.soft_cap = None if soft_cap < 0 else soft_cap
+    spawner.hard_cap = None if hard_cap < 0 else hard_cap
+    spawner.frame_budget = None
+
+
+class InputRecorder():
+    """
+    Used to create input recorder object.
+
+    Stores input state of every tick in TICK format,
+    held, pressed and released actions are bitmasks
+    over Controls.ACTIONS.
+    """
+    def __init__(self, path):
+        """
+        Initializes input recorder object.
+
+        Parameters
+        ----------
+        path : str (file written by save)
+        """
+        self.path = path
+        self.seed = 0
+        self.data = bytearray()
+        self.ticks = 0
+
+    def start(self, seed):
+        """
+        Drops recorded input and starts new session.
+
+        Parameters
+        ----------
+        seed : int (seed of random generator used in session)
+        """
+        self.seed = seed
+        self.data.clear()
+        self.ticks = 0
+
+    def capture(self, game):
+        """
+        Appends current input state of the game.
+
+        Parameters
+        ----------
+        game : Game()
+        """
+        controls = game.controls
+        self.data += TICK.pack(Controls.mask(controls.held),
+                               Controls.mask(controls.pressed),
+                               Controls.mask(controls.released),
+                               *controls.mouse_pos)
+        self.ticks += 1
+
+    def save(self, game, path=None):
+        """
+        Writes header, spawn settings, compressed input log
+        and digest of current game state to file.
+
+        Parameters
+        ----------
+        game : Game()
+        path : str = None (defaults to recorder path)
+        """
+        with open(path or self.path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.ticks))
+            file.write(pack_spawner(game.world.spawner))
+            file.write(state_digest(game))
+            file.write(zlib.compress(bytes(self.data), 9))
+
+
+class Replay(ScriptedInput):
+    """
+    Used to create replay object.
+    Inherits from ScriptedInput class.
+
+    Feeds recorded input into the game instead of pygame events.
+    """
+    def __init__(self, seed, ticks, data, digest=None, spawn=None):
+        """
+        Initializes replay object.
+
+        Parameters
+        ----------
+        seed : int
+        ticks : int
+        data : bytes (ticks records in TICK format)
+        digest : bytes = None (state digest at the end of recording)
+        spawn : bytes = None (spawn settings in SPAWN format,
+                              settings of the game are kept if None)
+        """
+        ScriptedInput.__init__(self)
+        self.seed = seed
+        self.ticks = ticks
+        self.data = data
+        self.digest = digest
+        self.spawn = spawn
+
+    def __len__(self):
+        return self.ticks
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns replay read from file.
+
+        Parameters
+        ----------
+        path : str
+        """
+        with open(path, 'rb') as file:
+            magic, version, seed, ticks = HEADER.unpack(
+                file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f'{path} is not a replay '
+                                 f'of version {VERSION}')
+            spawn = file.read(SPAWN.size)
+            digest = file.read(DIGEST_SIZE)
+            data = zlib.decompress(file.read())
+        return cls(seed, ticks, data, digest, spawn)
+
+    def apply(self, game, tick):
+        """
+        Sets input state of the game for given tick.
+
+        Parameters
+        ----------
+        game : Game()
+        tick : int
+        """
+        if not self.ticks:
+            return
+        held, pressed, released, x, y = TICK.unpack_from(
+            self.data, min(tick, self.ticks - 1) * TICK.size)
+        controls = game.controls
+        controls.held = Controls.unmask(held)
+        controls.pressed = Controls.unmask(pressed)
+        controls.released = Controls.unmask(released)
+        controls.mouse_pos = (x, y)
+
+    def play(self, game):
+        """
+        Resets the game and runs it with recorded input
+        and spawn settings.
+        Returns number of ticks run and whether
+        final state matches the recording.
+
+        Parameters
+        ----------
+        game : Game()
+        """
+        game.reset()
+        game.start_session(self.seed)
+        if self.spawn is not None:
+            unpack_spawner(self.spawn, game.world.spawner)
+        game.script = self
+        ticks = game.run(self.ticks)
+        return ticks, self.digest == state_digest(game)
@@ -0,0 +1,225 @@
+"""
+Game server class.
+
+Runs authoritative simulation of a headless game
+at fixed tick rate and sends snapshots to connected clients.
+The game has one player: the first connected client
+controls it, others watch until it disconnects.
+"""
+import asyncio
+from collections import deque
+from time import perf_counter
+from controls import Controls
+from profiler import percentiles
+from network import (WELCOME, INPUT, MSG_WELCOME, MSG_INPUT, MSG_SNAPSHOT,
+                     read_message, write_message, capture, encode)
+
+
+class Connection():
+    """
+    Used to create connection object.
+
+    Holds stream of one client, its last input
+    and entities of the last snapshot it was sent.
+    """
+    def __init__(self, uid, writer):
+        """
+        Initializes connection object.
+
+        Parameters
+        ----------
+        uid : int (client id)
+        writer : asyncio.StreamWriter
+        """
+        self.uid = uid
+        self.writer = writer
+        self.actions = set()
+        self.mouse_pos = (0, 0)
+        self.known = {}
+        self.bytes = 0
+        self.snapshots = 0
+        self.skipped = 0
+
+
+class GameServer():
+    """
+    Used to create game server object.
+
+    Snapshot is sent every snapshot_interval ticks.
+    Clients knowing the same entities share one encoded snapshot.
+    Client whose unsent data exceeds MAX_BUFFER
+    skips snapshots until it catches up,
+    its next snapshot covers all changes since the last one it got.
+    Lost game is restarted at once.
+    Timings of the last TIMED_TICKS ticks are kept for stats.
+    """
+    SNAPSHOT_INTERVAL = 4
+    MAX_BUFFER = 256 * 1024
+    TIMED_TICKS = 12000
+
+    def __init__(self, game, tick_rate=120,
+                 snapshot_interval=SNAPSHOT_INTERVAL):
+        """
+        Initializes game server object.
+
+        Parameters
+        ----------
+        game : Game() (headless game)
+        tick_rate : int (simulation ticks per second)
+        snapshot_interval : int (ticks between snapshots)
+        """
+        self.game = game
+        self.tick_rate = tick_rate
+        self.snapshot_interval = snapshot_interval
+        self.clients = []
+        self.next_uid = 0
+        self.server = None
+        self.port = None
+        self.state = ((), {})
+        self.ticks = 0
+        self.tick_times = deque(maxlen=GameServer.TIMED_TICKS)
+        self.encodes = 0
+        self.restarts = 0
+        game.playing = True
+
+    @property
+    def controller(self):
+        """
+        Returns connection controlling the player, None if empty.
+        """
+        return self.clients[0] if self.clients else None
+
+    async def start(self, host='127.0.0.1', port=0):
+        """
+        Starts accepting clients, port 0 picks free port.
+
+        Parameters
+        ----------
+        host : str
+        port : int
+        """
+        self.server = await asyncio.start_server(self.handle_client,
+                                                 host, port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def handle_client(self, reader, writer):
+        """
+        Registers client and reads its input until it disconnects.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+        writer : asyncio.StreamWriter
+        """
+        client = Connection(self.next_uid, writer)
+        self.next_uid += 1
+        self.clients.append(client)
+        write_message(writer, MSG_WELCOME, WELCOME.pack(
+            client.uid, self.tick_rate, self.snapshot_interval,
+            client is self.controller))
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                kind, payload = message
+                if kind == MSG_INPUT:
+                    held, x, y = INPUT.unpack(payload)
+                    client.actions = Controls.unmask(held)
+                    client.mouse_pos = (x, y)
+        finally:
+            self.clients.remove(client)
+            writer.close()
+
+    def tick(self):
+        """
+        Applies input of the controlling client,
+        advances simulation by one tick
+        and sends snapshots when it is time.
+        """
+        start = perf_counter()
+        game = self.game
+        controller = self.controller
+        if controller is not None:
+            game.controls.set_actions(controller.actions,
+                                      controller.mouse_pos)
+        else:
+            game.controls.set_actions((), game.controls.mouse_pos)
+        game.step()
+        if game.lost:
+            game.reset()
+            game.playing = True
+            self.restarts += 1
+        if game.ticks % self.snapshot_interval == 0:
+            self.broadcast()
+        self.tick_times.append(perf_counter() - start)
+        self.ticks += 1
+
+    def broadcast(self, force=False):
+        """
+        Sends snapshot to every client.
+
+        Parameters
+        ----------
+        force : bool (send also to clients with full buffers)
+        """
+        header, entities = self.state = capture(self.game)
+        encoded = {}
+        for client in self.clients:
+            transport = client.writer.transport
+            if not force and \
+               transport.get_write_buffer_size() > GameServer.MAX_BUFFER:
+                client.skipped += 1
+                continue
+            key = id(client.known)
+            data = encoded.get(key)
+            if data is None:
+                data = encode(header, client.known, entities)
+                encoded[key] = data
+                self.encodes += 1
+            write_message(client.writer, MSG_SNAPSHOT, data)
+            client.known = entities
+            client.bytes += len(data)
+            client.snapshots += 1
+
+    async def run(self, ticks=None):
+        """
+        Runs simulation at tick rate,
+        ticks which are late are run at once.
+
+        Parameters
+        ----------
+        ticks : int = None (number of ticks to run, forever if None)
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        count = 0
+        while ticks is None or count < ticks:
+            self.tick()
+            count += 1
+            next_tick += interval
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+
+    async def close(self):
+        """
+        Sends final snapshot to every client and disconnects them.
+        """
+        self.broadcast(force=True)
+        for client in list(self.clients):
+            client.writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    def stats(self):
+        """
+        Returns tick timings of the last TIMED_TICKS ticks
+        and traffic of every client.
+        """
+        return {'ticks': self.ticks,
+                'tick': percentiles(self.tick_times),
+                'encodes': self.encodes, 'restarts': self.restarts,
+                'clients': [{'uid': c.uid, 'bytes': c.bytes,
+                             'snapshots': c.snapshots,
+                             'skipped': c.skipped}
+                            for c in self.clients]}
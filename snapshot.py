@@ -0,0 +1,336 @@
+"""
+World snapshot class.
+
+Saves complete simulation state of a game (player, guns,
+zombies, bullets, spawn timer, controls and random generator)
+to compact binary data and restores it without loading assets.
+Used for restarting, rewinding and resuming saved games.
+"""
+import struct
+import sys
+from array import array
+from operator import attrgetter
+from gameObjects import Entity, Zombie, Bullet
+
+MAGIC = b'PGSV'
+VERSION = 2
+# magic, version, seed, ticks, spawn delay, next uid, zombies, bullets,
+# held actions, mouse x, mouse y
+HEADER = struct.Struct('<4sHQIiQIIHhh')
+# x, y, previous x, y, speed, current image, facing, gun, kills
+PLAYER = struct.Struct('<ddddddBBI')
+# version, Mersenne Twister state, has gauss_next, gauss_next
+RNG = struct.Struct('<I625I?d')
+# zombie and bullet state is stored as one array per field
+ZOMBIE_FIELDS = (('x', 'd'), ('y', 'd'), ('prev_x', 'd'), ('prev_y', 'd'),
+                 ('speed', 'd'), ('facing', 'b'), ('current_image', 'd'),
+                 ('hp', 'i'), ('uid', 'q'), ('lod_tick', 'q'))
+BULLET_FIELDS = (('x', 'd'), ('y', 'd'), ('prev_x', 'd'), ('prev_y', 'd'),
+                 ('x_speed', 'd'), ('y_speed', 'd'), ('damage', 'i'),
+                 ('frame', 'B'), ('uid', 'q'))
+
+
+def to_bytes(values):
+    """
+    Returns little-endian bytes of array.
+
+    Parameters
+    ----------
+    values : array.array
+    """
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def read_columns(data, offset, fields, count):
+    """
+    Returns dict of arrays stored by field
+    and offset after them.
+
+    Parameters
+    ----------
+    data : bytes
+    offset : int
+    fields : ((str, str), ...) (name and array type code)
+    count : int (length of every array)
+    """
+    columns = {}
+    for name, code in fields:
+        values = array(code)
+        size = values.itemsize * count
+        values.frombytes(data[offset:offset + size])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        columns[name] = values
+        offset += size
+    return columns, offset
+
+
+class WorldSnapshot():
+    """
+    Used to create world snapshot object.
+
+    Zombies are stored the same way for Zombie objects
+    and for the horde, so snapshot can be restored
+    in either zombie storage.
+    """
+    def __init__(self, data):
+        """
+        Initializes world snapshot object.
+
+        Parameters
+        ----------
+        data : bytes
+        """
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    @classmethod
+    def capture(cls, game):
+        """
+        Returns snapshot of current state of the game.
+
+        Parameters
+        ----------
+        game : Game()
+        """
+        world = game.world
+        player = game.player
+        controls = game.controls
+        zombies = world.zombies
+        horde = world.horde
+        zombie_count = len(zombies) + (horde.count if horde else 0)
+        held = controls.mask(controls.held)
+
+        parts = [HEADER.pack(MAGIC, VERSION, game.seed, game.ticks,
+                             world.spawn_delay, world.next_uid,
+                             zombie_count, len(world.bullets), held,
+                             *controls.mouse_pos),
+                 PLAYER.pack(player.x, player.y, player.prev_x,
+                             player.prev_y, player.speed,
+                             player.current_image, player.facing,
+                             player.guns.index(player.gun), player.kills),
+                 struct.pack(f'<{len(player.guns)}i',
+                             *(gun.delay for gun in player.guns))]
+
+        version, state, gauss = world.rng.getstate()
+        parts.append(RNG.pack(version, *state, gauss is not None,
+                              gauss or 0.0))
+
+        if horde is not None:
+            parts.extend(to_bytes(horde_column(horde, name, code))
+                         for name, code in ZOMBIE_FIELDS)
+        else:
+            parts.extend(object_columns(zombies, ZOMBIE_FIELDS))
+
+        bullets = world.bullets
+        frames = {id(frame): i for i, frame in enumerate(Bullet.frames)}
+        for name, code in BULLET_FIELDS:
+            if name == 'frame':
+                values = array(code, [frames[id(b.frame)] for b in bullets])
+            else:
+                values = array(code, map(attrgetter(name), bullets))
+            parts.append(to_bytes(values))
+        return cls(b''.join(parts))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Returns snapshot read from file.
+
+        Parameters
+        ----------
+        path : str
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f'{path} is not a world snapshot')
+        version = struct.unpack_from('<H', data, 4)[0]
+        if version != VERSION:
+            raise ValueError(f'unsupported snapshot version {version}')
+        return cls(data)
+
+    def save(self, path):
+        """
+        Writes snapshot to file.
+
+        Parameters
+        ----------
+        path : str
+        """
+        with open(path, 'wb') as file:
+            file.write(self.data)
+
+    def restore(self, game):
+        """
+        Replaces state of the game with the snapshot.
+        Zombies are restored to the horde if the world uses one.
+        Next uid never goes back, so entities created after
+        a restart or rewind do not reuse uids known by clients.
+        Held actions are restored only for headless
+        or scripted games, windowed game starts with nothing held.
+
+        Parameters
+        ----------
+        game : Game()
+        """
+        data = self.data
+        (_, _, seed, ticks, spawn_delay, next_uid, zombie_count,
+         bullet_count, held, mouse_x, mouse_y) = HEADER.unpack_from(data)
+        offset = HEADER.size
+        (x, y, prev_x, prev_y, speed, current_image, facing, gun,
+         kills) = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        player = game.player
+        delays = struct.unpack_from(f'<{len(player.guns)}i', data, offset)
+        offset += 4 * len(player.guns)
+        rng = RNG.unpack_from(data, offset)
+        offset += RNG.size
+        zombies, offset = read_columns(data, offset, ZOMBIE_FIELDS,
+                                       zombie_count)
+        bullets, offset = read_columns(data, offset, BULLET_FIELDS,
+                                       bullet_count)
+
+        world = game.world
+        game.seed = seed
+        game.ticks = ticks
+        game.lost = False
+        world.next_uid = max(world.next_uid, next_uid)
+        world.rng.setstate((rng[0], tuple(rng[1:626]),
+                            rng[627] if rng[626] else None))
+        game.controls.clear()
+        if game.headless or game.script is not None:
+            # keys of a window are not held after restoring, their
+            # releases would be ignored and actions would stay held
+            game.controls.held = game.controls.unmask(held)
+        game.controls.mouse_pos = (mouse_x, mouse_y)
+        if world.flow_field is not None:
+            world.flow_field.target = -1
+
+        player.move_to((x, y))
+        player.prev_x, player.prev_y = prev_x, prev_y
+        player.speed = int(speed)
+        player.facing = facing
+        player.images = player.image_sets[facing]
+        player.current_image = current_image
+        player.image = player.images[int(current_image)]
+        player.gun = player.guns[gun]
+        player.kills = kills
+        for g, delay in zip(player.guns, delays):
+            g.delay = delay
+        game.camera.follow(player.rect)
+
+        Zombie.reset(world)
+        world.spawn_delay = spawn_delay
+        if world.horde is not None:
+            restore_horde(world.horde, zombies, zombie_count)
+        else:
+            restore_zombies(game, zombies)
+        restore_bullets(game, bullets)
+
+
+def object_columns(objects, fields):
+    """
+    Returns list of little-endian bytes with values of fields
+    of every object, read in one pass over objects.
+
+    Parameters
+    ----------
+    objects : list
+    fields : ((str, str), ...) (name and array type code)
+    """
+    if not objects:
+        return [b''] * len(fields)
+    rows = map(attrgetter(*(name for name, _ in fields)), objects)
+    count = len(objects)
+    return [struct.pack(f'<{count}{code}', *values)
+            for (_, code), values in zip(fields, zip(*rows))]
+
+
+def horde_column(horde, name, code):
+    """
+    Returns live values of horde field as array.
+
+    Parameters
+    ----------
+    horde : Horde()
+    name : str
+    code : str (array type code)
+    """
+    return array(code, getattr(horde, name)[:horde.count].astype(code)
+                 .tobytes())
+
+
+def restore_horde(horde, columns, count):
+    """
+    Fills horde with zombies stored in columns.
+
+    Parameters
+    ----------
+    horde : Horde()
+    columns : dict (arrays by field)
+    count : int
+    """
+    while len(horde.x) < count:
+        horde.grow()
+    for name, _ in ZOMBIE_FIELDS:
+        getattr(horde, name)[:count] = columns[name]
+    horde.count = count
+
+
+def restore_zombies(game, columns):
+    """
+    Creates Zombie objects stored in columns,
+    taken from the pool and added to drawn entities at once.
+
+    Parameters
+    ----------
+    game : Game()
+    columns : dict (arrays by field)
+    """
+    world = game.world
+    zombies = world.zombie_pool.acquire_many(len(columns['uid']), game)
+    for z, x, y, prev_x, prev_y, speed, facing, current_image, hp, uid, \
+            lod_tick in zip(zombies, *(columns[name]
+                                       for name, _ in ZOMBIE_FIELDS)):
+        z.game = game
+        z.x, z.y = x, y
+        z.prev_x, z.prev_y = prev_x, prev_y
+        z.rect.topleft = (x, y)
+        z.speed = int(speed)
+        z.facing = facing
+        z.current_image = current_image
+        z.hp = hp
+        z.uid = uid
+        z.lod_tick = lod_tick
+    Entity.add_many(world, zombies)
+
+
+def restore_bullets(game, columns):
+    """
+    Creates bullets stored in columns.
+
+    Parameters
+    ----------
+    game : Game()
+    columns : dict (arrays by field)
+    """
+    world = game.world
+    world.bullet_pool.clear()
+    for x, y, prev_x, prev_y, x_speed, y_speed, damage, frame, uid in zip(
+            *(columns[name] for name, _ in BULLET_FIELDS)):
+        b = world.bullet_pool.acquire()
+        if b is None:
+            break
+        b.game = game
+        b.x, b.y = x, y
+        b.prev_x, b.prev_y = prev_x, prev_y
+        b.rect.topleft = (x, y)
+        b.x_speed, b.y_speed = x_speed, y_speed
+        b.damage = damage
+        b.frame = Bullet.frames[frame]
+        b.uid = uid
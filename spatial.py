@@ -0,0 +1,112 @@
+"""
+Spatial index class.
+
+Used to speed up collision checks between
+large numbers of in-game objects.
+"""
+
+
+class SpatialGrid():
+    """
+    Uniform grid dividing given area into square cells.
+
+    Every inserted object is stored in each cell its rect overlaps,
+    objects outside of the area are kept in the nearest border cells.
+    """
+    def __init__(self, bounds, cell_size=64):
+        """
+        Initializes spatial grid object.
+
+        Parameters
+        ----------
+        bounds : pygame.Rect (area covered by the grid)
+        cell_size : int
+        """
+        self.left, self.top = bounds[0], bounds[1]
+        self.cell_size = cell_size
+        self.columns = max(1, -(-bounds[2] // cell_size))
+        self.rows = max(1, -(-bounds[3] // cell_size))
+        self.cells = [[] for _ in range(self.columns * self.rows)]
+        self.items = []
+
+    def clear(self):
+        """
+        Removes all objects from the grid.
+        """
+        for cell in self.cells:
+            cell.clear()
+        self.items = []
+
+    def cell_range(self, rect):
+        """
+        Returns range of columns and rows overlapped by rect,
+        clamped to the grid borders.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+        """
+        size = self.cell_size
+        last_column, last_row = self.columns - 1, self.rows - 1
+        x1 = min(max((rect[0] - self.left) // size, 0), last_column)
+        y1 = min(max((rect[1] - self.top) // size, 0), last_row)
+        x2 = min(max((rect[0] + rect[2] - 1 - self.left) // size, 0),
+                 last_column)
+        y2 = min(max((rect[1] + rect[3] - 1 - self.top) // size, 0),
+                 last_row)
+        return int(x1), int(y1), int(x2), int(y2)
+
+    def insert(self, item):
+        """
+        Adds object to every cell overlapped by its rect.
+
+        Parameters
+        ----------
+        item : object with rect attribute
+        """
+        x1, y1, x2, y2 = self.cell_range(item.rect)
+        index = len(self.items)
+        self.items.append(item)
+
+        for row in range(y1, y2 + 1):
+            start = row * self.columns
+            for column in range(x1, x2 + 1):
+                self.cells[start + column].append(index)
+
+    def rebuild(self, items):
+        """
+        Clears the grid and inserts given objects.
+
+        Parameters
+        ----------
+        items : list
+        """
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def query(self, rect):
+        """
+        Returns objects colliding with rect,
+        in the order they were inserted.
+
+        Parameters
+        ----------
+        rect : pygame.Rect
+        """
+        x1, y1, x2, y2 = self.cell_range(rect)
+        cells = self.cells
+
+        if x1 == x2 and y1 == y2:
+            candidates = cells[y1 * self.columns + x1]
+        else:
+            candidates = set()
+            for row in range(y1, y2 + 1):
+                start = row * self.columns
+                for column in range(x1, x2 + 1):
+                    candidates.update(cells[start + column])
+            candidates = sorted(candidates)
+
+        items = self.items
+        return [items[index] for index in candidates
+                if rect.colliderect(items[index].rect)]
@@ -0,0 +1,207 @@
+"""
+Spawn scheduler class.
+
+Decides when and where zombies appear:
+spawn delay follows a wave curve, population is limited
+by soft and hard caps and spawning can be throttled
+when frames take longer than the frame budget.
+"""
+import math
+from gameObjects import Zombie
+
+
+class SpawnScheduler():
+    """
+    Used to create spawn scheduler object.
+
+    Wave number is the number of WAVE_TICKS passed in the session,
+    curve returns spawn delay (in ticks) of a wave:
+    'constant' keeps BASE_DELAY, 'linear' lowers it by STEP
+    every wave and 'exponential' multiplies it by DECAY,
+    never going below MIN_DELAY. Curve can also be any callable
+    taking wave number.
+
+    Above soft cap the delay grows with the population,
+    at hard cap nothing spawns.
+    Spawn point is chosen from spawns of the world:
+    'random' picks any, 'offscreen' prefers points outside
+    the camera view and 'far' prefers points at least
+    MIN_DISTANCE from the player.
+
+    With frame budget (seconds of work per frame) every frame
+    measured by the profiler over budget makes spawning slower,
+    frames under budget slowly bring it back.
+    Budget makes spawning depend on the machine,
+    so it is not used by headless games
+    and while recording input.
+
+    Arguments left as None are read from CURVE, SOFT_CAP,
+    HARD_CAP, SELECTION and FRAME_BUDGET when the scheduler
+    is created, set SOFT_CAP or HARD_CAP to None for no cap.
+    """
+    CURVES = ('constant', 'linear', 'exponential')
+    SELECTIONS = ('random', 'offscreen', 'far')
+    CURVE = 'constant'
+    SELECTION = 'random'
+    BASE_DELAY = Zombie.SPAWN_DELAY
+    MIN_DELAY = 6
+    WAVE_TICKS = 3600
+    STEP = 2
+    DECAY = 0.9
+    SOFT_CAP = 300
+    HARD_CAP = 500
+    MIN_DISTANCE = 200
+    FRAME_BUDGET = None
+    MAX_THROTTLE = 8.0
+    THROTTLE_UP = 1.25
+    THROTTLE_DOWN = 0.99
+
+    def __init__(self, world, curve=None, soft_cap=None, hard_cap=None,
+                 selection=None, frame_budget=None):
+        """
+        Initializes spawn scheduler object.
+
+        Parameters
+        ----------
+        world : World()
+        curve : str or callable = None (wave number -> spawn delay)
+        soft_cap : int = None
+        hard_cap : int = None
+        selection : str = None (one of SELECTIONS)
+        frame_budget : float = None (seconds, no feedback
+                                     if FRAME_BUDGET is None too)
+        """
+        if curve is None:
+            curve = SpawnScheduler.CURVE
+        if soft_cap is None:
+            soft_cap = SpawnScheduler.SOFT_CAP
+        if hard_cap is None:
+            hard_cap = SpawnScheduler.HARD_CAP
+        if selection is None:
+            selection = SpawnScheduler.SELECTION
+        if frame_budget is None:
+            frame_budget = SpawnScheduler.FRAME_BUDGET
+        if not callable(curve) and curve not in SpawnScheduler.CURVES:
+            raise ValueError(f'unknown spawn curve {curve!r}')
+        if selection not in SpawnScheduler.SELECTIONS:
+            raise ValueError(f'unknown spawn point selection {selection!r}')
+        self.world = world
+        self.curve = curve
+        self.soft_cap = soft_cap
+        self.hard_cap = hard_cap
+        self.selection = selection
+        self.frame_budget = frame_budget
+        self.throttle = 1.0
+        self.frames_seen = 0
+        self.spawned = 0
+        self.capped = 0
+
+    def wave(self):
+        """
+        Returns number of the current wave.
+        """
+        return self.world.game.ticks // SpawnScheduler.WAVE_TICKS
+
+    def wave_delay(self, wave):
+        """
+        Returns spawn delay of wave given by the curve.
+
+        Parameters
+        ----------
+        wave : int
+        """
+        if callable(self.curve):
+            return self.curve(wave)
+        if self.curve == 'linear':
+            delay = SpawnScheduler.BASE_DELAY - SpawnScheduler.STEP * wave
+        elif self.curve == 'exponential':
+            delay = SpawnScheduler.BASE_DELAY * SpawnScheduler.DECAY ** wave
+        else:
+            return SpawnScheduler.BASE_DELAY
+        return max(SpawnScheduler.MIN_DELAY, delay)
+
+    def delay(self, population):
+        """
+        Returns ticks until the next spawn.
+
+        Parameters
+        ----------
+        population : int (number of live zombies)
+        """
+        delay = self.wave_delay(self.wave())
+        soft, hard = self.soft_cap, self.hard_cap
+        if soft is not None and population > soft:
+            if hard is not None and hard > soft:
+                delay *= (hard - soft) / max(hard - population, 1)
+            else:
+                delay *= population / max(soft, 1)
+        if self.throttle != 1.0:
+            delay *= self.throttle
+        return math.ceil(delay)
+
+    def spawn_point(self):
+        """
+        Returns spawn point chosen by selection mode.
+        """
+        world = self.world
+        spawns = world.spawns
+        if self.selection == 'offscreen':
+            view = world.game.camera.view
+            spawns = [s for s in spawns
+                      if not view.collidepoint(s)] or spawns
+        elif self.selection == 'far':
+            px, py = world.game.player.rect.center
+            spawns = [s for s in spawns
+                      if math.hypot(s[0] - px, s[1] - py)
+                      >= SpawnScheduler.MIN_DISTANCE] or spawns
+        return world.rng.choice(spawns)
+
+    def measure(self):
+        """
+        Updates throttle with frames measured by the profiler
+        since the previous call.
+        """
+        profiler = self.world.game.profiler
+        new = min(profiler.frames - self.frames_seen, profiler.size)
+        self.frames_seen = profiler.frames
+        for i in range(1, new + 1):
+            work = profiler.work_times[(profiler.index - i) % profiler.size]
+            if work > self.frame_budget:
+                self.throttle = min(self.throttle * SpawnScheduler.THROTTLE_UP,
+                                    SpawnScheduler.MAX_THROTTLE)
+            else:
+                self.throttle = max(self.throttle
+                                    * SpawnScheduler.THROTTLE_DOWN, 1.0)
+
+    def update(self):
+        """
+        Spawns zombie when spawn delay passes
+        and population is under hard cap.
+        """
+        world = self.world
+        game = world.game
+        if self.frame_budget is not None and not game.headless \
+           and game.recorder is None:
+            self.measure()
+        if world.spawn_delay < 0:
+            population = Zombie.count(world)
+            if self.hard_cap is None or population < self.hard_cap:
+                if world.horde is not None:
+                    world.horde.spawn(self.spawn_point())
+                else:
+                    Zombie.spawn(world.game, self.spawn_point())
+                self.spawned += 1
+                population += 1
+            else:
+                self.capped += 1
+            world.spawn_delay = self.delay(population)
+        world.spawn_delay -= 1
+
+    def stats(self):
+        """
+        Returns wave, current delay, throttle and spawn counters.
+        """
+        return {'wave': self.wave(),
+                'delay': self.delay(Zombie.count(self.world)),
+                'throttle': self.throttle, 'spawned': self.spawned,
+                'capped': self.capped}
@@ -0,0 +1,102 @@
+"""
+Text cache class.
+
+Keeps loaded fonts and rendered text surfaces,
+so that drawing the same text again costs only a lookup.
+"""
+import pygame
+from collections import OrderedDict
+
+
+class TextCache():
+    """
+    Used to create text cache object.
+
+    Fonts are cached by size, rendered surfaces are kept
+    in least recently used order and evicted
+    when their total size exceeds memory limit.
+    """
+    def __init__(self, font_path, max_bytes=4 * 1024 * 1024):
+        """
+        Initializes text cache object.
+
+        Parameters
+        ----------
+        font_path : str
+        max_bytes : int (memory limit for rendered surfaces)
+        """
+        self.font_path = font_path
+        self.max_bytes = max_bytes
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, size):
+        """
+        Returns font of given size,
+        loads it from disk only once.
+
+        Parameters
+        ----------
+        size : int
+        """
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(self.font_path, size)
+            self.fonts[size] = font
+        return font
+
+    def render(self, text, size, color):
+        """
+        Returns surface with rendered text.
+
+        Parameters
+        ----------
+        text : str
+        size : int
+        color : (int, int, int)
+        """
+        key = (text, size, tuple(color))
+        surface = self.surfaces.get(key)
+
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(size).render(text, True, color)
+        self.surfaces[key] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        self.evict()
+        return surface
+
+    def evict(self):
+        """
+        Removes least recently used surfaces
+        until memory limit is met.
+        The newest surface is always kept.
+        """
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, surface = self.surfaces.popitem(last=False)
+            self.bytes -= surface.get_pitch() * surface.get_height()
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Removes all rendered surfaces from cache.
+        """
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """
+        Returns cache statistics.
+        """
+        return {'fonts': len(self.fonts), 'surfaces': len(self.surfaces),
+                'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions}
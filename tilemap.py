@@ -0,0 +1,285 @@
+"""
+Tile map and camera classes.
+
+Map is divided into square chunks which are loaded
+only when the camera gets close to them,
+so memory and drawing cost depend on the window size,
+not on the size of the map.
+"""
+import pygame
+import os
+import json
+from collections import OrderedDict
+from render import RenderQueue
+
+
+class TileMap():
+    """
+    Used to create tile map object.
+
+    Chunk (column, row) covers area of chunk_size pixels
+    starting at (column * chunk_size, row * chunk_size).
+    Chunks are created by loader on first use and kept
+    in LRU cache of at most max_chunks surfaces.
+    Without max_chunks the cache holds twice the chunks
+    drawn and prefetched around the camera view,
+    so small chunks are not evicted while still in use.
+    """
+    CHUNK_SIZE = 256
+    MAX_CHUNKS = None
+    # spawn points on map of BASE_SIZE, scaled to other sizes
+    BASE_SIZE = (1024, 512)
+    SPAWNS = ((240, 160), (240, 368), (784, 160), (784, 368))
+
+    def __init__(self, loader, size, chunk_size=CHUNK_SIZE,
+                 max_chunks=MAX_CHUNKS, spawns=None, obstacles=()):
+        """
+        Initializes tile map object.
+
+        Parameters
+        ----------
+        loader : callable (returns surface of chunk (column, row))
+        size : (int, int) (size of the map in pixels)
+        chunk_size : int
+        max_chunks : int = None (size of chunk cache,
+                                 set by the first draw if None,
+                                 nothing is evicted before that)
+        spawns : ((int, int), ...) = None (zombie spawn points,
+                                          SPAWNS scaled to size if None)
+        obstacles : ((int, int, int, int), ...) (areas of the map
+                                                 blocking movement)
+        """
+        self.loader = loader
+        self.rect = pygame.Rect((0, 0), size)
+        self.chunk_size = chunk_size
+        self.columns = -(-size[0] // chunk_size)
+        self.rows = -(-size[1] // chunk_size)
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()
+        self.loads = 0
+        if spawns is None:
+            base_w, base_h = TileMap.BASE_SIZE
+            spawns = [(x * size[0] // base_w, y * size[1] // base_h)
+                      for x, y in TileMap.SPAWNS]
+        self.spawns = tuple(tuple(spawn) for spawn in spawns)
+        self.obstacles = tuple(pygame.Rect(rect) for rect in obstacles)
+
+    @classmethod
+    def from_image(cls, image, repeat=(1, 1), chunk_size=CHUNK_SIZE):
+        """
+        Returns map made of image repeated given number of times,
+        chunks are subsurfaces of the image.
+
+        Parameters
+        ----------
+        image : pygame.Surface
+        repeat : (int, int) (number of copies in a row and column)
+        chunk_size : int
+        """
+        width, height = image.get_size()
+        if width % chunk_size or height % chunk_size:
+            raise ValueError(f'chunk size {chunk_size} does not divide '
+                             f'image size {width}x{height}')
+
+        def load(column, row):
+            x = column * chunk_size % width
+            y = row * chunk_size % height
+            return image.subsurface((x, y, chunk_size, chunk_size))
+
+        return cls(load, (width * repeat[0], height * repeat[1]),
+                   chunk_size)
+
+    @classmethod
+    def from_directory(cls, path, convert=True):
+        """
+        Returns map baked by TileMap.bake,
+        chunks are read from path/column_row.png on first use.
+
+        Parameters
+        ----------
+        path : str
+        convert : bool (convert chunks to display format)
+        """
+        with open(os.path.join(path, 'index.json')) as file:
+            index = json.load(file)
+
+        def load(column, row):
+            chunk = pygame.image.load(os.path.join(path,
+                                                   f'{column}_{row}.png'))
+            if convert and pygame.display.get_surface() is not None:
+                chunk = chunk.convert()
+            return chunk
+
+        return cls(load, index['size'], index['chunk_size'],
+                   spawns=index.get('spawns'),
+                   obstacles=index.get('obstacles', ()))
+
+    @staticmethod
+    def bake(image, path, repeat=(1, 1), chunk_size=CHUNK_SIZE):
+        """
+        Saves image repeated given number of times
+        as chunk files and index.json in path.
+
+        Parameters
+        ----------
+        image : pygame.Surface
+        path : str (output directory)
+        repeat : (int, int)
+        chunk_size : int
+        """
+        os.makedirs(path, exist_ok=True)
+        source = TileMap.from_image(image, repeat, chunk_size)
+        for row in range(source.rows):
+            for column in range(source.columns):
+                pygame.image.save(source.chunk(column, row),
+                                  os.path.join(path, f'{column}_{row}.png'))
+        with open(os.path.join(path, 'index.json'), 'w') as file:
+            json.dump({'size': source.rect.size,
+                       'chunk_size': source.chunk_size,
+                       'spawns': source.spawns,
+                       'obstacles': []}, file, indent=2)
+        return source
+
+    def chunk(self, column, row):
+        """
+        Returns surface of chunk, loading it if needed.
+
+        Parameters
+        ----------
+        column : int
+        row : int
+        """
+        key = (column, row)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+
+        chunk = self.loader(column, row)
+        self.loads += 1
+        self.chunks[key] = chunk
+        while self.max_chunks is not None and \
+                len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def cache_size(self, view_size, prefetch=1):
+        """
+        Returns twice the largest number of chunks
+        drawn and prefetched around view of given size.
+
+        Parameters
+        ----------
+        view_size : (int, int)
+        prefetch : int
+        """
+        size = self.chunk_size
+        columns = view_size[0] // size + 2 + 2 * prefetch
+        rows = view_size[1] // size + 2 + 2 * prefetch
+        return 2 * columns * rows
+
+    def chunk_range(self, view, margin=0):
+        """
+        Returns first and last column and row
+        of chunks overlapping view.
+
+        Parameters
+        ----------
+        view : pygame.Rect (area in map coordinates)
+        margin : int (extra chunks around view)
+        """
+        size = self.chunk_size
+        x1 = max(view.left // size - margin, 0)
+        y1 = max(view.top // size - margin, 0)
+        x2 = min((view.right - 1) // size + margin, self.columns - 1)
+        y2 = min((view.bottom - 1) // size + margin, self.rows - 1)
+        return x1, y1, x2, y2
+
+    def draw(self, render_queue, camera, prefetch=1):
+        """
+        Adds chunks visible by camera to MAP layer of render queue.
+        Chunks within prefetch chunks of the view are loaded,
+        so that scrolling does not wait for the disk.
+
+        Parameters
+        ----------
+        render_queue : RenderQueue()
+        camera : Camera()
+        prefetch : int
+        """
+        if self.max_chunks is None:
+            self.max_chunks = self.cache_size(camera.view.size, prefetch)
+        x1, y1, x2, y2 = self.chunk_range(camera.view, prefetch)
+        visible = self.chunk_range(camera.view)
+        size = self.chunk_size
+        ox, oy = camera.view.topleft
+
+        for row in range(y1, y2 + 1):
+            for column in range(x1, x2 + 1):
+                chunk = self.chunk(column, row)
+                if visible[0] <= column <= visible[2] and \
+                   visible[1] <= row <= visible[3]:
+                    render_queue.add(RenderQueue.MAP, chunk,
+                                     (column * size - ox, row * size - oy))
+
+    def stats(self):
+        """
+        Returns number of cached chunks, cache size and chunk loads.
+        """
+        return {'chunks': len(self.chunks), 'max_chunks': self.max_chunks,
+                'loads': self.loads,
+                'columns': self.columns, 'rows': self.rows}
+
+
+class Camera():
+    """
+    Used to create camera object.
+
+    View is the part of the map shown in the window,
+    it follows the target and never leaves the map.
+    """
+    def __init__(self, size, bounds):
+        """
+        Initializes camera object.
+
+        Parameters
+        ----------
+        size : (int, int) (size of the window)
+        bounds : pygame.Rect (area of the map)
+        """
+        self.view = pygame.Rect((0, 0), size)
+        self.bounds = bounds
+        self.moved = True
+
+    def follow(self, target):
+        """
+        Centers view on target rect, clamped to map.
+
+        Parameters
+        ----------
+        target : pygame.Rect
+        """
+        previous = self.view.topleft
+        self.view.center = target.center
+        self.view.clamp_ip(self.bounds)
+        self.moved = self.moved or self.view.topleft != previous
+
+    def to_world(self, pos):
+        """
+        Returns map position of window position.
+
+        Parameters
+        ----------
+        pos : (int, int)
+        """
+        return (pos[0] + self.view.x, pos[1] + self.view.y)
+
+    def to_screen(self, pos):
+        """
+        Returns window position of map position.
+
+        Parameters
+        ----------
+        pos : (int, int)
+        """
+        return (pos[0] - self.view.x, pos[1] - self.view.y)
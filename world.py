@@ -0,0 +1,102 @@
+"""
+World class.
+
+Holds state of one simulation, so that many independent
+worlds can exist in the same process.
+"""
+import random
+from gameObjects import Entity, Zombie, Bullet
+from spatial import SpatialGrid
+from pool import Pool
+from flowfield import FlowField
+from spawner import SpawnScheduler
+
+
+class World():
+    """
+    Used to create world object.
+
+    Contains drawn entities, pools of zombies and bullets,
+    collision grid, optional horde, optional flow field,
+    spawn timer and scheduler, spawn points
+    and random generator of the simulation.
+    Entities reach their world through game.world.
+    """
+    def __init__(self, game, bounds, spawns, cell_size=64,
+                 obstacles=None):
+        """
+        Initializes world object.
+
+        Parameters
+        ----------
+        game : Game()
+        bounds : pygame.Rect (area of the map)
+        spawns : ((int, int), ...) (zombie spawn points)
+        cell_size : int (size of collision grid cell)
+        obstacles : (pygame.Rect, ...) = None (obstacles of flow field,
+                                               no field if None,
+                                               field covers camera view
+                                               around the player)
+        """
+        self.game = game
+        self.entities = []
+        self.zombie_pool = Pool(Zombie, Zombie.CAPACITY)
+        self.zombies = self.zombie_pool.live
+        self.bullet_pool = Pool(Bullet, Bullet.CAPACITY)
+        self.bullets = self.bullet_pool.live
+        self.spawn_delay = Zombie.SPAWN_DELAY
+        self.spawns = spawns
+        self.spawner = SpawnScheduler(self)
+        self.use_grid = True
+        self.lod_budget = Zombie.LOD_BUDGET
+        self.grid = SpatialGrid(bounds, cell_size)
+        self.horde = None
+        self.flow_field = None
+        if obstacles is not None:
+            window = game.camera.view.inflate(2 * FlowField.MARGIN,
+                                              2 * FlowField.MARGIN).size
+            self.flow_field = FlowField(bounds, FlowField.CELL_SIZE,
+                                        obstacles, window)
+        self.rng = random.Random()
+        self.next_uid = 0
+
+    def reserve(self, zombies, bullets):
+        """
+        Creates pooled objects ahead of time.
+
+        Parameters
+        ----------
+        zombies : int
+        bullets : int
+        """
+        self.zombie_pool.reserve(zombies, self.game)
+        self.bullet_pool.reserve(bullets)
+
+    def new_uid(self):
+        """
+        Returns id not used by any other entity of the world,
+        used to tell entities apart in network snapshots.
+        """
+        uid = self.next_uid
+        self.next_uid += 1
+        return uid
+
+    def reset(self):
+        """
+        Deletes every zombie, bullet and entity.
+        """
+        Zombie.reset(self)
+        Bullet.reset(self)
+        Entity.reset(self)
+
+    def stats(self):
+        """
+        Returns number of live objects and pool statistics.
+        """
+        return {'zombies': Zombie.count(self), 'bullets': len(self.bullets),
+                'entities': len(self.entities),
+                'zombie_pool': self.zombie_pool.stats(),
+                'bullet_pool': self.bullet_pool.stats(),
+                'spawner': self.spawner.stats(),
+                'flow_field': (self.flow_field.stats()
+                               if self.flow_field is not None else None)}